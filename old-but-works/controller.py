@@ -1,4 +1,4 @@
-from typing import Tuple
+from typing import List, Tuple
 
 from get_adjacent import get_adjacent
 from model import Model
@@ -19,7 +19,7 @@ class Controller:
         :param height: The vertical span of the array
         :param num_mines: The number of mines to be seeded
         :param difficulty: A string choosing game difficulty. Choose from 'Easy', 'Medium', or 'hard'
-        :param view_type: A string choosing game type. The choice is either 'GUI', or 'TEXT'
+        :param view_type: A string choosing game type. The choice is 'GUI', 'CANVAS', or 'TEXT'
         """
         self.width = width
         self.height = height
@@ -29,19 +29,19 @@ class Controller:
         if view_type == "GUI":
             self.view = view.GUIView(self.width, self.height,
                                 self.num_mines, self)
+        elif view_type == "CANVAS":
+            self.view = view.CanvasView(self.width, self.height,
+                                   self.num_mines, self)
         elif view_type == "TEXT":
             self.view = view.TextView(self.width, self.height,
                                  self.num_mines, self)
         self.view.main()
 
     def reset(self) -> None:
-        """Resets the game"""
+        """Resets the game. The view is cleared in place and keeps its window and event loop."""
 
-        self.view.reset_view()
         self.model = Model(self.width, self.height, self.num_mines)
-        self.view = view.GUIView(self.width, self.height,
-                            self.num_mines, self)
-        self.view.main()
+        self.view.reset_view()
 
     def reveal_decision(self, index: Tuple[int, int]) -> None:
         """Main decision method determining how to reveal cell."""
@@ -67,32 +67,56 @@ class Controller:
             self.win()
         self.update_mines()
 
-    def reveal_cell(self, index: Tuple[int, int], value: int or str) -> None:
-        """Obtains cell value from model and passes the value to view."""
+    def reveal_cell(self, index: Tuple[int, int], value: int or str, batch: List = None) -> None:
+        """Obtains cell value from model and passes the value to view.
 
+        With a batch the cell is appended to it instead, for the caller to pass to view.reveal_cells.
+        """
         if index not in self.model.get_cells_flagged():
             self.model.get_cells_revealed().add(index)
-            self.view.reveal_cell(index, value)
+            if batch is None:
+                self.view.reveal_cell(index, value)
+            else:
+                batch.append((index, value))
 
-    def reveal_zeroes(self, index: Tuple[int, int]) -> None:
-        """Reveals all adjacent cells just until a mine is reached."""
+    def reveal_zeroes(self, index: Tuple[int, int], batch: List = None) -> None:
+        """Reveals the zero region around a cell together with its numbered border.
 
-        val = self.model.get_cell_value(index)
-
-        if val == 0:
-            self.reveal_cell(index, val)
-            self.reveal_adjacent(index)
-
-            for coords in get_adjacent(index):
-                if (
-                        0 <= coords[0] <= self.width - 1
-                        and self.height - 1 >= coords[1] >= 0 == self.model.get_cell_value(coords)
-                        and coords not in self.model.get_revealed_zeroes()
-                ):
-                    self.model.get_revealed_zeroes().add(coords)
-                    self.reveal_zeroes(coords)
-
-    def reveal_adjacent(self, index: Tuple[int, int]) -> None:
+        The region is searched iteratively and every cell is visited once.
+        Flagged cells are searched through but stay hidden. The whole cascade
+        is handed to the view in one reveal_cells call.
+        """
+        if batch is None:
+            batch = []
+            self.reveal_zeroes(index, batch)
+            if batch:
+                self.view.reveal_cells(batch)
+            return
+
+        if self.model.get_cell_value(index) != 0:
+            return
+        revealed = self.model.get_cells_revealed()
+        revealed_zeroes = self.model.get_revealed_zeroes()
+        stack = [index]
+        visited = {index}
+        while stack:
+            cell = stack.pop()
+            val = self.model.get_cell_value(cell)
+            if val == 0:
+                revealed_zeroes.add(cell)
+                for coords in get_adjacent(cell):
+                    if (
+                            0 <= coords[0] <= self.width - 1
+                            and 0 <= coords[1] <= self.height - 1
+                            and coords not in visited
+                            and coords not in revealed
+                    ):
+                        visited.add(coords)
+                        stack.append(coords)
+            if cell not in revealed:
+                self.reveal_cell(cell, val, batch)
+
+    def reveal_adjacent(self, index: Tuple[int, int], batch: List = None) -> None:
         """Reveals the 8 adjacent cells to the input cell's index."""
 
         for coords in get_adjacent(index):
@@ -101,7 +125,7 @@ class Controller:
                     and 0 <= coords[1] <= self.height - 1
             ):
                 cell_value = self.model.get_cell_value(coords)
-                self.reveal_cell(coords, cell_value)
+                self.reveal_cell(coords, cell_value, batch)
 
     def update_flagged_cell(self, index: Tuple[int, int]) -> None:
         """Flag/unflag cells for possible mines. Does not reveal cell."""
@@ -142,8 +166,6 @@ class Controller:
         self.model.change_game_state("loss")
         self.view.display_loss()
 
-        #        Reveals all cells
-        for row in range(self.height):
-            for col in range(self.width):
-                cell_value = self.model.get_cell_value((col, row))
-                self.view.reveal_cell((col, row), cell_value)
+        #        Reveals all cells in one batch
+        self.view.reveal_cells([((col, row), self.model.get_cell_value((col, row)))
+                                for row in range(self.height) for col in range(self.width)])
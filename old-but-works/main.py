@@ -22,7 +22,7 @@ class InitializeGame:
 
         self.view_label = Label(self.root, text="Choose a view type")
         self.view_label.grid()
-        self.view_types = ["GUI", "TEXT"]
+        self.view_types = ["GUI", "CANVAS", "TEXT"]
 
         def create_button(view_type: str) -> Button:
             button = Button(self.root, width=7, bg='grey', text=view_type)
@@ -33,7 +33,7 @@ class InitializeGame:
                                 create_button(view_type) for view_type in self.view_types
                             ] + [self.view_label]
 
-        for i in range(2):
+        for i in range(len(self.view_types)):
             def closure_helper(f, view_choice: str):
                 def g(_):
                     f(view_choice)
@@ -1,4 +1,3 @@
-from itertools import product
 from random import sample
 from typing import Set, Tuple, List, Union
 
@@ -38,7 +37,8 @@ class Model:
     def _add_mines(self) -> None:
         """Randomly adds mines to board grid."""
 
-        for x, y in sample(list(product(range(self.width), range(self.height))), self.num_mines):
+        for index in sample(range(self.width * self.height), self.num_mines):
+            y, x = divmod(index, self.width)
             self.grid[y][x] = self.mine
 
     def grid_coords(self) -> List[Tuple[int, int]]:
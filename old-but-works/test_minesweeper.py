@@ -1,9 +1,15 @@
+import importlib.util
 import itertools
+import os
 import random
+import sys
+import time
 import unittest
 
+from controller import Controller
 from get_adjacent import get_adjacent
 from model import Model
+from view import CanvasView
 
 
 class TestGetAdjacent(unittest.TestCase):
@@ -66,5 +72,138 @@ class TestModel(unittest.TestCase):
                         )
 
 
+REFACTORED_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "refactored-text-only")
+
+
+def load_refactored_controller():
+    """Imports the refactored controller module under another name, as it clashes with controller.py here."""
+
+    if REFACTORED_DIR not in sys.path:
+        # Appended so that the modules of this directory win any name clash
+        sys.path.append(REFACTORED_DIR)
+    spec = importlib.util.spec_from_file_location(
+        "refactored_controller", os.path.join(REFACTORED_DIR, "controller.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class RecordingView:
+    """Stands in for a view, recording the methods the controller calls."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __getattr__(self, name):
+        return lambda *args: self.calls.append((name, args))
+
+
+class TestController(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(4)
+        # Skips __init__, which creates a view and starts its main loop
+        self.controller = Controller.__new__(Controller)
+        self.controller.width, self.controller.height, self.controller.num_mines = 9, 8, 10
+        self.controller.model = Model(9, 8, 10)
+        self.controller.view = RecordingView()
+
+    def test_reset_keeps_view(self):
+        view, model = self.controller.view, self.controller.model
+        self.controller.update_flagged_cell((0, 0))
+        self.controller.reset()
+        self.assertIs(self.controller.view, view)
+        self.assertIsNot(self.controller.model, model)
+        self.assertEqual(self.controller.model.get_cells_flagged(), set())
+        self.assertEqual([name for name, _ in view.calls], ["flag_cell", "update_mines_left", "reset_view"])
+
+    def test_cascade_is_one_batch(self):
+        self.controller.model = Model(9, 8, 0)
+        self.controller.num_mines = 0
+        self.controller.reveal_decision((4, 4))
+        names = [name for name, _ in self.controller.view.calls]
+        self.assertEqual(names, ["reveal_cells", "display_win", "update_mines_left"])
+        batch = self.controller.view.calls[0][1][0]
+        self.assertEqual({index for index, _ in batch}, set(self.controller.model.grid_coords))
+
+    def test_loss_reveals_one_batch(self):
+        model = self.controller.model
+        mine = next(coords for coords in model.grid_coords if model.is_mine(coords))
+        self.controller.reveal_decision(mine)
+        names = [name for name, _ in self.controller.view.calls]
+        self.assertEqual(names, ["display_loss", "reveal_cells", "update_mines_left"])
+        batch = self.controller.view.calls[1][1][0]
+        self.assertEqual(len(batch), 9 * 8)
+        self.assertIn((mine, -1), batch)
+
+
+class TestRevealZeroes(unittest.TestCase):
+
+    def make_controller(self, model: Model) -> Controller:
+        controller = Controller.__new__(Controller)
+        controller.width, controller.height, controller.num_mines = model.width, model.height, model.num_mines
+        controller.model = model
+        controller.view = RecordingView()
+        return controller
+
+    def test_matches_refactored_controller(self):
+        refactored = load_refactored_controller()
+        coordinate = sys.modules["coordinate"]
+        width, height = 30, 20
+        for seed in range(12):
+            num_mines = 20 + seed * 10
+            refactored_controller = refactored.Controller(width, height, num_mines, seed=seed)
+            board = refactored_controller.board
+
+            model = Model(width, height, 0)
+            model.grid = [[-1 if board.get_cell_value(coordinate.Coordinate(y, x)).isMine() else 0
+                           for x in range(width)] for y in range(height)]
+            model.num_mines = num_mines
+            model._set_adjacent_mine_count()
+            controller = self.make_controller(model)
+
+            rng = random.Random(seed)
+            for _ in range(5):
+                x, y = rng.randrange(width), rng.randrange(height)
+                controller.update_flagged_cell((x, y))
+                refactored_controller.update_flagged_cell(coordinate.Coordinate(y, x))
+            zeroes = [(x, y) for x, y in model.grid_coords if model.get_cell_value((x, y)) == 0
+                      and (x, y) not in model.get_cells_flagged()]
+            for x, y in rng.sample(zeroes, min(3, len(zeroes))):
+                controller.view.calls.clear()
+                controller.reveal_zeroes((x, y))
+                expected = refactored_controller.reveal_zeroes(coordinate.Coordinate(y, x))
+                batch = controller.view.calls[0][1][0] if controller.view.calls else []
+                self.assertEqual(len(batch), len(set(index for index, _ in batch)))
+                self.assertEqual(sorted(batch), sorted(((coord.col, coord.row), value.value)
+                                                       for coord, value in expected))
+            self.assertEqual(model.get_cells_revealed(),
+                             {(coord.col, coord.row) for coord in board.cells_revealed()})
+
+    def test_large_empty_board(self):
+        controller = self.make_controller(Model(500, 500, 0))
+        start = time.perf_counter()
+        controller.reveal_decision((250, 250))
+        self.assertLess(time.perf_counter() - start, 10)
+        names = [name for name, _ in controller.view.calls]
+        self.assertEqual(names, ["reveal_cells", "display_win", "update_mines_left"])
+        self.assertEqual(len(controller.view.calls[0][1][0]), 500 * 500)
+
+
+class TestCanvasView(unittest.TestCase):
+
+    def test_cell_at(self):
+        # Skips __init__, which needs a display
+        canvas_view = CanvasView.__new__(CanvasView)
+        canvas_view.width, canvas_view.height = 20, 16
+        size = canvas_view.cell_size
+        self.assertEqual(canvas_view._cell_at(0, 0), (0, 0))
+        self.assertEqual(canvas_view._cell_at(size - 1, size), (0, 1))
+        self.assertEqual(canvas_view._cell_at(19 * size + 3, 15 * size + 3), (19, 15))
+        self.assertIsNone(canvas_view._cell_at(20 * size, 0))
+        self.assertIsNone(canvas_view._cell_at(0, 16 * size))
+        self.assertIsNone(canvas_view._cell_at(-1, 0))
+
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -1,5 +1,5 @@
-from tkinter import Button, Label, Tk, Frame, StringVar
-from typing import Tuple, List, Union
+from tkinter import Button, Canvas, Label, Tk, Frame, StringVar
+from typing import Iterable, Tuple, List, Union
 
 import controller
 
@@ -30,6 +30,7 @@ class GUIView:
             -1: "black"
             }
         self.master.title('Minesweeper')
+        self.changed_cells = set()
 
     def _create_buttons(self) -> list:
         """Create cell button widgets."""
@@ -69,26 +70,43 @@ class GUIView:
             '<Button>', lambda event: self.controller.reset())
 
     def reset_view(self) -> None:
-        """Destroys the GUI. Controller will create a new GUI"""
+        """Returns the GUI to a new game in place. Only the cells changed since the last game are touched."""
 
-        self.master.destroy()
+        for x, y in self.changed_cells:
+            self.buttons[y][x].configure(text="", bg="grey")
+        self.changed_cells.clear()
+        self.top_panel.reset()
 
     def reveal_cell(self, index: Tuple[int, int], value: Union[int, str]) -> None:
         """Reveals cell's value on GUI."""
 
         x, y = index
         self.buttons[y][x].configure(text=value, bg=self.color_dict[value])
+        self.changed_cells.add(index)
+
+    def reveal_cells(self, batch: Iterable[Tuple[Tuple[int, int], Union[int, str]]]) -> None:
+        """Reveals a batch of cells, such as a cascade or the game over reveal, on GUI.
+
+        Tk repaints once the batch is applied, rather than after every cell.
+        """
+        buttons, color_dict, changed_cells = self.buttons, self.color_dict, self.changed_cells
+        for index, value in batch:
+            x, y = index
+            buttons[y][x].configure(text=value, bg=color_dict[value])
+            changed_cells.add(index)
 
     def flag_cell(self, index: Tuple[int, int]) -> None:
         """Flag cell in GUI"""
 
         x, y = index
         self.buttons[y][x].configure(text="FLAG", bg="yellow")
+        self.changed_cells.add(index)
 
     def unflag_cell(self, index: Tuple[int, int]) -> None:
         """Unflag cell in GUI"""
         x, y = index
         self.buttons[y][x].configure(text="", bg="grey")
+        self.changed_cells.discard(index)
 
     def update_mines_left(self, mines: int) -> None:
         """Updates mine counter widget"""
@@ -113,6 +131,112 @@ class GUIView:
         self.master.mainloop()
 
 
+class CanvasView(GUIView):
+    """Creates a GUI that draws the whole board on a single canvas.
+
+    Hidden cells are the canvas background, so only revealed and flagged
+    cells own canvas items and a change touches just the items of that cell.
+    Clicks are mapped to cells from the pointer position by one handler per
+    mouse button.
+    """
+
+    cell_size = 28
+
+    def _create_canvas(self) -> Canvas:
+        """Create the board canvas with its grid lines."""
+
+        canvas = Canvas(self.master, width=self.width * self.cell_size,
+                        height=self.height * self.cell_size, bg='grey', highlightthickness=0)
+        canvas.grid(row=5, column=1, columnspan=max(self.width, 10))
+        for x in range(1, self.width):
+            canvas.create_line(x * self.cell_size, 0, x * self.cell_size, self.height * self.cell_size)
+        for y in range(1, self.height):
+            canvas.create_line(0, y * self.cell_size, self.width * self.cell_size, y * self.cell_size)
+        return canvas
+
+    def _cell_at(self, x: int, y: int) -> Union[Tuple[int, int], None]:
+        """Returns the (x, y) index of the cell under a canvas position, or None outside the board."""
+
+        index = (x // self.cell_size, y // self.cell_size)
+        if 0 <= index[0] < self.width and 0 <= index[1] < self.height:
+            return index
+        return None
+
+    def _initialize_bindings(self) -> None:
+        """Set up the reveal cell and the flag cell mouse bindings."""
+
+        def closure_helper(f):
+            def g(event):
+                index = self._cell_at(event.x, event.y)
+                if index is not None:
+                    f(index)
+            return g
+
+        # Left click reveals, right click flags
+        self.canvas.bind('<Button-1>', closure_helper(self.controller.reveal_decision))
+        self.canvas.bind('<Button-3>', closure_helper(self.controller.update_flagged_cell))
+
+        # Set up reset button
+        self.top_panel.reset_button.bind(
+            '<Button>', lambda event: self.controller.reset())
+
+    def _draw_cell(self, index: Tuple[int, int], text: str, color: str) -> None:
+        """Draws a cell, reusing its canvas items if it already has them."""
+
+        items = self.cell_items.get(index)
+        if items is None:
+            x, y = index
+            left, top = x * self.cell_size, y * self.cell_size
+            rectangle = self.canvas.create_rectangle(
+                left, top, left + self.cell_size, top + self.cell_size, fill=color, tags="cell")
+            label = self.canvas.create_text(
+                left + self.cell_size // 2, top + self.cell_size // 2, text=text, tags="cell")
+            self.cell_items[index] = (rectangle, label)
+        else:
+            rectangle, label = items
+            self.canvas.itemconfigure(rectangle, fill=color)
+            self.canvas.itemconfigure(label, text=text)
+
+    def reveal_cell(self, index: Tuple[int, int], value: Union[int, str]) -> None:
+        """Reveals cell's value on the canvas."""
+
+        self._draw_cell(index, str(value), self.color_dict[value])
+
+    def reveal_cells(self, batch: Iterable[Tuple[Tuple[int, int], Union[int, str]]]) -> None:
+        """Reveals a batch of cells on the canvas."""
+
+        color_dict = self.color_dict
+        for index, value in batch:
+            self._draw_cell(index, str(value), color_dict[value])
+
+    def flag_cell(self, index: Tuple[int, int]) -> None:
+        """Flag cell on the canvas"""
+
+        self._draw_cell(index, "F", "yellow")
+
+    def reset_view(self) -> None:
+        """Returns the GUI to a new game in place by deleting the items of revealed and flagged cells."""
+
+        self.canvas.delete("cell")
+        self.cell_items.clear()
+        self.top_panel.reset()
+
+    def unflag_cell(self, index: Tuple[int, int]) -> None:
+        """Unflag cell on the canvas"""
+
+        items = self.cell_items.pop(index, None)
+        if items is not None:
+            self.canvas.delete(*items)
+
+    def main(self) -> None:
+        self.top_panel = TopPanel(self.master, self.num_mines)
+        self.canvas = self._create_canvas()
+        self.cell_items = {}
+        self.top_panel.mines_left.grid(row=0, columnspan=5)
+        self._initialize_bindings()
+        self.master.mainloop()
+
+
 class TopPanel(Frame):
     """Creates a top panel which contains game information."""
 
@@ -132,6 +256,13 @@ class TopPanel(Frame):
         self.mine_count.set('Mines remaining: ' + str(self.num_mines))
         self.mines_left = Label(textvariable=self.mine_count)
 
+    def reset(self) -> None:
+        """Hides the win and loss labels and restores the mine counter."""
+
+        self.loss_label.grid_remove()
+        self.win_label.grid_remove()
+        self.mine_count.set('Mines remaining: ' + str(self.num_mines))
+
 
 class TextView:
     """Creates a text interface of the minesweeper game."""
@@ -161,6 +292,12 @@ class TextView:
         self.cell_view = self.cell_view()
         self.show_grid()
 
+    def reset_view(self) -> None:
+        """Clears the text view for a new game."""
+
+        self.cell_view = [["cell"] * self.width for _ in range(self.height)]
+        self.show_grid()
+
     def cell_view(self) -> List[List[str]]:
         """Create text view of cells."""
 
@@ -182,6 +319,13 @@ class TextView:
         x, y = index
         self.cell_view[y][x] = self.reveal_dict[value]
 
+    def reveal_cells(self, batch: Iterable[Tuple[Tuple[int, int], int]]) -> None:
+        """Reveals a batch of cells in the text view"""
+
+        cell_view, reveal_dict = self.cell_view, self.reveal_dict
+        for (x, y), value in batch:
+            cell_view[y][x] = reveal_dict[value]
+
     def flag_cell(self, index: Tuple[int, int]) -> None:
         """Flags cell in cell_view"""
 
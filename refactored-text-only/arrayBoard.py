@@ -0,0 +1,83 @@
+from typing import AbstractSet
+
+import numpy as np
+
+from bitset import BitSet
+from board import Board
+from coordinate import Coordinate
+from cellEntry import Entry, EntryValue
+from minePlacement import skip_excluded
+
+
+# EntryValue for each cell value, indexed by value + 1 (mines are -1)
+_ENTRY_VALUES = [EntryValue(value) for value in range(-1, 9)]
+
+# Shared Entry for each cell value, indexed the same way
+_ENTRIES = [Entry.of(value) for value in _ENTRY_VALUES]
+
+
+class ArrayBoard(Board):
+    """Board stored as an int8 array of cell values. Mines are -1.
+
+    Mines are drawn in a single vectorized sample and the adjacent mine
+    counts come from one 3x3 sum over the padded mine mask, so generation
+    stays fast on very large grids.
+    """
+
+    # Labelling zero regions cell by cell would dominate the vectorized generation
+    index_zero_regions = False
+
+    def _create_random(self) -> np.random.Generator:
+        """Returns the random generator used to place mines."""
+
+        return np.random.default_rng(self._seed)
+
+    def _create_grid(self) -> None:
+        """Creates a grid of zeroes."""
+
+        self._grid = np.zeros((self._height, self._width), dtype=np.int8)
+
+    def _add_mines(self, excluded: AbstractSet[int] = frozenset()) -> None:
+        """Randomly adds mines to board grid, skipping the excluded cell indices."""
+
+        flat_indices = self._random.choice(
+            self._total_cells - len(excluded), self._num_mines, replace=False)
+        self._grid.flat[skip_excluded(flat_indices, excluded)] = -1
+
+    def _set_adjacent_mine_count(self) -> None:
+        """Sets cell values to the number of their adjacent mines."""
+
+        mines = self._grid == -1
+        padded = np.pad(mines, 1).astype(np.int8)
+        counts = np.zeros(mines.shape, dtype=np.int8)
+        for row_offset in range(3):
+            for col_offset in range(3):
+                counts += padded[row_offset:row_offset + self._height,
+                                 col_offset:col_offset + self._width]
+        self._grid = np.where(mines, np.int8(-1), counts)
+
+    def set_cell(self, coord: Coordinate, entry: Entry) -> None:
+        """Stores the Entry's value at the given index."""
+
+        self._grid[coord.row, coord.col] = entry.value.value
+
+    def get_cell_entry(self, coord: Coordinate) -> Entry:
+        """Returns Entry object at the given index."""
+
+        return _ENTRIES[self._grid.item(coord.row, coord.col) + 1]
+
+    def get_cell_value(self, coord: Coordinate) -> EntryValue:
+        """Returns EntryValue at the given index."""
+
+        return _ENTRY_VALUES[self._grid.item(coord.row, coord.col) + 1]
+
+    def mine_bitset(self) -> BitSet:
+        """Returns the mine layout as a BitSet of row-major cell indices."""
+
+        return BitSet.from_mask(self._grid == -1)
+
+    def print(self) -> None:
+        """Prints the cell values one row per line."""
+
+        for row in self._grid.tolist():
+            print(" ".join(map(str, row)))
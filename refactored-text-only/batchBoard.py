@@ -0,0 +1,155 @@
+import numpy as np
+
+# Per board status codes, mirroring GameState
+ONGOING = 0
+WIN = 1
+LOSS = 2
+
+
+def _dilate(mask: np.ndarray) -> np.ndarray:
+    """Returns the cells of each board in the stack that are in or adjacent to mask."""
+
+    height, width = mask.shape[1:]
+    padded = np.pad(mask, ((0, 0), (1, 1), (1, 1)))
+    result = np.zeros(mask.shape, dtype=bool)
+    for row_offset in range(3):
+        for col_offset in range(3):
+            result |= padded[:, row_offset:row_offset + height, col_offset:col_offset + width]
+    return result
+
+
+class BatchBoard:
+    """Plays many boards of the same dimensions at once, one move per board per step.
+
+    Layouts, adjacent counts and revealed and flagged cells are stacked
+    arrays with one layer per board, and every step applies the moves with
+    array operations. The rules follow Controller.reveal_decision and
+    Controller.update_flagged_cell.
+    """
+
+    def __init__(self, width: int, height: int, num_mines: int, num_boards: int,
+                 seed: int = None, mines: np.ndarray = None):
+        """
+        :param width: The horizontal span of the array
+        :param height: The vertical span of the array
+        :param num_mines: The number of mines to be seeded on each board
+        :param num_boards: The number of boards played at once
+        :param seed: Seed for reproducible layouts
+        :param mines: Optional boolean array of shape (num_boards, height, width) with the layouts to play
+        """
+        self.width = width
+        self.height = height
+        self.num_mines = num_mines
+        self.num_boards = num_boards
+        self._rng = np.random.default_rng(seed)
+        if mines is None:
+            mines = self._random_layouts()
+        self._mines = np.asarray(mines, dtype=bool).reshape(num_boards, height, width)
+        self._counts = None
+        self._revealed = None
+        self._flagged = None
+        self._status = None
+        self._set_adjacent_mine_count()
+        self._create_cell_state()
+
+    def _random_layouts(self) -> np.ndarray:
+        """Returns num_boards random layouts, each with exactly num_mines mines."""
+
+        total_cells = self.width * self.height
+        keys = self._rng.random((self.num_boards, total_cells))
+        mines = np.zeros((self.num_boards, total_cells), dtype=bool)
+        if self.num_mines:
+            chosen = np.argpartition(keys, self.num_mines - 1, axis=1)[:, :self.num_mines]
+            np.put_along_axis(mines, chosen, True, axis=1)
+        return mines
+
+    def _set_adjacent_mine_count(self) -> None:
+        """Counts the adjacent mines of every cell of every board. Mines hold -1."""
+
+        padded = np.pad(self._mines, ((0, 0), (1, 1), (1, 1))).astype(np.int8)
+        counts = np.zeros(self._mines.shape, dtype=np.int8)
+        for row_offset in range(3):
+            for col_offset in range(3):
+                counts += padded[:, row_offset:row_offset + self.height, col_offset:col_offset + self.width]
+        self._counts = np.where(self._mines, np.int8(-1), counts)
+
+    def _create_cell_state(self) -> None:
+        self._revealed = np.zeros(self._mines.shape, dtype=bool)
+        self._flagged = np.zeros(self._mines.shape, dtype=bool)
+        self._status = np.full(self.num_boards, ONGOING, dtype=np.int8)
+
+    def reset(self) -> None:
+        """Starts new random games on every board."""
+
+        self._mines = self._random_layouts().reshape(self.num_boards, self.height, self.width)
+        self._set_adjacent_mine_count()
+        self._create_cell_state()
+
+    @property
+    def mines(self) -> np.ndarray:
+        return self._mines
+
+    @property
+    def counts(self) -> np.ndarray:
+        return self._counts
+
+    @property
+    def revealed(self) -> np.ndarray:
+        return self._revealed
+
+    @property
+    def flagged(self) -> np.ndarray:
+        return self._flagged
+
+    @property
+    def status(self) -> np.ndarray:
+        return self._status
+
+    def mines_left(self) -> np.ndarray:
+        return self.num_mines - self._flagged.sum(axis=(1, 2))
+
+    def step(self, rows: np.ndarray, cols: np.ndarray, flag: np.ndarray = None) -> np.ndarray:
+        """Applies one move to every board that is still being played.
+
+        :param rows: The row of each board's move
+        :param cols: The column of each board's move
+        :param flag: Optional booleans. True flags or unflags the cell instead of revealing it
+        :return: The status of each board: ONGOING, WIN or LOSS
+        """
+        rows = np.asarray(rows)
+        cols = np.asarray(cols)
+        flag = np.zeros(self.num_boards, dtype=bool) if flag is None else np.asarray(flag, dtype=bool)
+        boards = np.arange(self.num_boards)
+        playing = self._status == ONGOING
+        hidden = ~self._revealed[boards, rows, cols]
+
+        # Flag or unflag cells that are not revealed
+        toggled = boards[playing & flag & hidden]
+        self._flagged[toggled, rows[toggled], cols[toggled]] ^= True
+
+        reveal = playing & ~flag & hidden & ~self._flagged[boards, rows, cols]
+        values = self._counts[boards, rows, cols]
+        single = boards[reveal & (values != 0)]
+        self._revealed[single, rows[single], cols[single]] = True
+        self._status[single[values[single] == -1]] = LOSS
+
+        cascading = boards[reveal & (values == 0)]
+        if cascading.size:
+            self._reveal_zeroes(cascading, rows[cascading], cols[cascading])
+
+        unrevealed = self.width * self.height - self._revealed.sum(axis=(1, 2))
+        self._status[(self._status == ONGOING) & (unrevealed == self.num_mines)] = WIN
+        return self._status.copy()
+
+    def _reveal_zeroes(self, boards: np.ndarray, rows: np.ndarray, cols: np.ndarray) -> None:
+        """Reveals the zero region around the given cell of each given board."""
+
+        zeroes = self._counts[boards] == 0
+        region = np.zeros(zeroes.shape, dtype=bool)
+        region[np.arange(boards.size), rows, cols] = True
+        while True:
+            grown = _dilate(region) & zeroes
+            if np.array_equal(grown, region):
+                break
+            region = grown
+        self._revealed[boards] |= _dilate(region) & ~self._flagged[boards]
@@ -0,0 +1,173 @@
+"""
+Times board generation, cascades, game-over reveals, flagging and rendering
+over a ladder of board sizes and mine densities.
+
+    python benchmarks.py --sizes 10 100 500 --save baseline.json
+    python benchmarks.py --sizes 10 100 500 --baseline baseline.json
+
+Every result records operations per second and peak traced memory. With
+--baseline the run is compared against a saved file and slower or larger
+results are flagged as regressions; the exit status is 1 if any were found.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+from arrayBoard import ArrayBoard
+from bitBoard import BitBoard
+from board import Board
+from controller import Controller
+from coordinate import Coordinate
+from views import AnsiTextView, TextView
+
+
+BOARD_CLASSES = {"board": Board, "array": ArrayBoard, "bit": BitBoard}
+
+DEFAULT_SIZES = [10, 100, 500, 1000, 2000]
+
+DEFAULT_DENSITIES = [0.1, 0.2]
+
+# Number of flag toggles timed as one update_flagged_cell operation batch
+FLAG_TOGGLES = 1000
+
+
+def measure(action: Callable[[], None], setup: Callable[[], None] = None, min_seconds: float = 0.2) -> Dict[str, float]:
+    """Runs action until min_seconds have been spent in it and once more under tracemalloc.
+
+    setup runs before every call of action and is not timed.
+    """
+    runs = 0
+    elapsed = 0.0
+    while runs == 0 or elapsed < min_seconds:
+        if setup:
+            setup()
+        start = time.perf_counter()
+        action()
+        elapsed += time.perf_counter() - start
+        runs += 1
+    if setup:
+        setup()
+    tracemalloc.start()
+    action()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {"ops_per_sec": runs / elapsed, "peak_bytes": peak}
+
+
+def run_benchmarks(sizes: List[int], densities: List[float], board_class=Board,
+                   log: Callable[[str], None] = print) -> Dict[str, Dict[str, float]]:
+    """Returns the results keyed by "board class/benchmark/size/density"."""
+
+    results = {}
+
+    def record(name: str, result: Dict[str, float]) -> None:
+        name = board_class.__name__ + "/" + name
+        results[name] = result
+        log("{:<44} {:>14.2f} ops/sec {:>12.1f} KiB".format(name, result["ops_per_sec"], result["peak_bytes"] / 1024))
+
+    for size in sizes:
+        total_cells = size * size
+        for density in densities:
+            num_mines = int(total_cells * density)
+            board = board_class(size, size, num_mines)
+            label = "{}x{}/{}".format(size, size, density)
+            record("board_init/" + label, measure(lambda: board_class(size, size, num_mines)))
+            record("board_reset/" + label, measure(board.reset))
+
+        # Worst case cascade: no mines, so one click reveals the whole board
+        label = "{}x{}".format(size, size)
+        controller = Controller(size, size, 0, board_class=board_class)
+
+        def hide_cells():
+            controller.reset()
+
+        record("reveal_cascade/" + label, measure(lambda: controller.reveal_decision(Coordinate(0, 0)),
+                                                  setup=hide_cells))
+        record("reveal_all_cells/" + label, measure(controller.reveal_all_cells, setup=hide_cells))
+
+        coords = [Coordinate(index % size, index * 7 % size) for index in range(FLAG_TOGGLES)]
+
+        def toggle_flags():
+            for coord in coords:
+                controller.update_flagged_cell(coord)
+
+        hide_cells()
+        record("update_flagged_cell/" + label, measure(toggle_flags))
+
+        view = TextView(size, size, 0, controller=controller, play=False)
+        view.create_cell_view()
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            result = measure(lambda: (view.show_grid(), output.seek(0), output.truncate()))
+        record("show_grid/" + label, result)
+
+        # Incremental repaint after a single flag toggle
+        ansi_view = AnsiTextView(size, size, 0, controller=controller, play=False, output=io.StringIO())
+        ansi_view.show_grid()
+
+        def repaint():
+            if ansi_view.cell_view[0][0] == ansi_view.cell_value:
+                ansi_view.flag_cell(Coordinate(0, 0))
+            else:
+                ansi_view.unflag_cell(Coordinate(0, 0))
+            ansi_view.show_grid()
+            ansi_view.output.seek(0)
+            ansi_view.output.truncate()
+
+        record("ansi_show_grid/" + label, measure(repaint))
+    return results
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]],
+            tolerance: float) -> List[str]:
+    """Returns a message per result more than tolerance slower or larger than its baseline."""
+
+    regressions = []
+    for name, result in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        if result["ops_per_sec"] < previous["ops_per_sec"] * (1 - tolerance):
+            regressions.append("{}: {:.2f} ops/sec, was {:.2f}".format(
+                name, result["ops_per_sec"], previous["ops_per_sec"]))
+        if result["peak_bytes"] > previous["peak_bytes"] * (1 + tolerance):
+            regressions.append("{}: {} peak bytes, was {}".format(
+                name, result["peak_bytes"], previous["peak_bytes"]))
+    return regressions
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Minesweeper benchmarks")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="board widths and heights to time")
+    parser.add_argument("--densities", type=float, nargs="+", default=DEFAULT_DENSITIES,
+                        help="mine densities used for board generation")
+    parser.add_argument("--board", choices=sorted(BOARD_CLASSES), default="board",
+                        help="Board implementation to time")
+    parser.add_argument("--save", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare the results with this JSON file")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="allowed slowdown or memory growth before flagging a regression")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.sizes, args.densities, BOARD_CLASSES[args.board])
+    if args.save:
+        with open(args.save, "w") as file:
+            json.dump(results, file, indent=2, sort_keys=True)
+    if args.baseline:
+        with open(args.baseline) as file:
+            regressions = compare(results, json.load(file), args.tolerance)
+        for regression in regressions:
+            print("REGRESSION " + regression)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+from typing import AbstractSet
+
+import numpy as np
+
+from bitset import BitSet, CoordinateBitSet
+from board import Board
+from coordinate import Coordinate
+from cellEntry import Entry, EntryValue
+from minePlacement import skip_excluded
+
+
+# EntryValue for each adjacent mine count
+_COUNT_VALUES = [EntryValue(value) for value in range(9)]
+
+# Generation works on bands of about this many cells to bound peak memory
+_BAND_CELLS = 1 << 22
+
+
+class BitBoard(Board):
+    """Board packed into bitsets and 4 bit adjacent mine counts.
+
+    Mines, revealed cells and flagged cells take one bit per cell and the
+    adjacent mine counts take half a byte, so a 10,000x10,000 board needs
+    under 90 MB. cells_revealed() and cells_flagged() are views over the
+    bitsets, making reveal and flag checks constant time.
+    """
+
+    index_zero_regions = False
+
+    def _create_cell_sets(self) -> None:
+        """Creates empty bitsets of revealed and flagged cells."""
+
+        self._cells_revealed = CoordinateBitSet(BitSet(self._total_cells), self._width, self._height)
+        self._cells_flagged = CoordinateBitSet(BitSet(self._total_cells), self._width, self._height)
+
+    def _create_random(self) -> np.random.Generator:
+        """Returns the random generator used to place mines."""
+
+        return np.random.default_rng(self._seed)
+
+    def _create_grid(self) -> None:
+        """Creates an empty mine bitset and zeroed adjacent mine counts."""
+
+        self._mines = BitSet(self._total_cells)
+        self._counts = bytearray((self._total_cells + 1) // 2)
+
+    def _band_rows(self) -> int:
+        """Returns the number of rows generated at once. Always a multiple of 8 so bands start on a byte."""
+
+        rows = max(1, _BAND_CELLS // self._width)
+        return (rows + 7) // 8 * 8
+
+    def _add_mines(self, excluded: AbstractSet[int] = frozenset()) -> None:
+        """Randomly adds mines to board grid one band of rows at a time, skipping the excluded cell indices."""
+
+        rng = self._random
+        band_rows = self._band_rows()
+        band_starts = range(0, self._height, band_rows)
+        band_sizes = [min(band_rows, self._height - row) * self._width for row in band_starts]
+        band_excluded = [[index - row * self._width for index in excluded if 0 <= index - row * self._width < size]
+                         for row, size in zip(band_starts, band_sizes)]
+        band_mines = rng.multivariate_hypergeometric(
+            [size - len(skipped) for size, skipped in zip(band_sizes, band_excluded)], self._num_mines)
+        mines = self._mines.array()
+        for row, size, skipped, num_mines in zip(band_starts, band_sizes, band_excluded, band_mines):
+            mask = np.zeros(size, dtype=bool)
+            mask[skip_excluded(rng.choice(size - len(skipped), num_mines, replace=False), skipped)] = True
+            first_byte = row * self._width >> 3
+            packed = np.packbits(mask, bitorder="little")
+            mines[first_byte:first_byte + packed.size] = packed
+        self._mines = BitSet(self._total_cells, self._mines.buffer)
+
+    def _set_adjacent_mine_count(self) -> None:
+        """Packs the number of adjacent mines of every cell into the counts, one band of rows at a time."""
+
+        width, height = self._width, self._height
+        band_rows = self._band_rows()
+        for row in range(0, height, band_rows):
+            stop = min(row + band_rows, height)
+            top, bottom = max(row - 1, 0), min(stop + 1, height)
+            mines = self._mines.unpack(top * width, bottom * width).reshape(bottom - top, width)
+            padded = np.pad(mines, ((int(top == row), int(bottom == stop)), (1, 1))).astype(np.uint8)
+            counts = np.zeros((stop - row, width), dtype=np.uint8)
+            for row_offset in range(3):
+                for col_offset in range(3):
+                    counts += padded[row_offset:row_offset + stop - row, col_offset:col_offset + width]
+            counts = counts.ravel()
+            if counts.size % 2:
+                counts = np.append(counts, np.uint8(0))
+            start = row * width >> 1
+            self._counts[start:start + counts.size // 2] = (counts[0::2] | counts[1::2] << 4).tobytes()
+
+    def set_cell(self, coord: Coordinate, entry: Entry) -> None:
+        """Adds or removes a mine, or stores the adjacent mine count of a safe cell."""
+
+        index = coord.row * self._width + coord.col
+        if entry.isMine():
+            self._mines.add(index)
+            return
+        self._mines.discard(index)
+        shift = (index & 1) << 2
+        self._counts[index >> 1] = self._counts[index >> 1] & (0xF0 >> shift) | entry.value.value << shift
+
+    def get_cell_entry(self, coord: Coordinate) -> Entry:
+        """Returns Entry object at the given index."""
+
+        return Entry.of(self.get_cell_value(coord))
+
+    def get_cell_value(self, coord: Coordinate) -> EntryValue:
+        """Returns EntryValue at the given index."""
+
+        index = coord.row * self._width + coord.col
+        if index in self._mines:
+            return EntryValue.MINE
+        return _COUNT_VALUES[self._counts[index >> 1] >> ((index & 1) << 2) & 0xF]
+
+    def mine_bitset(self) -> BitSet:
+        """Returns the board's own mine BitSet."""
+
+        return self._mines
+
+    def print(self) -> None:
+        """Prints the cell values one row per line."""
+
+        self._print_cell_values()
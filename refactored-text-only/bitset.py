@@ -0,0 +1,139 @@
+from collections.abc import MutableSet
+from typing import Iterator
+
+import numpy as np
+
+from coordinate import Coordinate, from_index
+
+
+# Number of set bits in every possible byte value
+_POPCOUNT = np.array([bin(byte).count("1") for byte in range(256)], dtype=np.uint8)
+
+
+class BitSet:
+    """A fixed size set of cell indices stored as one bit per cell.
+
+    Bit i lives in byte i // 8 at position i % 8, which matches
+    numpy's packbits with bitorder="little".
+    """
+
+    def __init__(self, size: int, buffer=None, count: int = None):
+        """
+        :param size: The number of cell indices the set can hold
+        :param buffer: Optional writable buffer holding existing bits
+        :param count: The number of bits set in buffer, if known. Counted when None, which reads the whole buffer
+        """
+        self._size = size
+        if buffer is None:
+            self._bits = bytearray((size + 7) // 8)
+            self._count = 0
+        else:
+            self._bits = buffer
+            self._count = int(_POPCOUNT[self.array()].sum(dtype=np.int64)) if count is None else count
+
+    @classmethod
+    def from_mask(cls, mask: np.ndarray) -> "BitSet":
+        """Returns a BitSet holding the indices of the true values of a boolean array."""
+
+        mask = np.asarray(mask, dtype=bool).ravel()
+        return cls(mask.size, bytearray(np.packbits(mask, bitorder="little").tobytes()))
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @property
+    def buffer(self):
+        return self._bits
+
+    def array(self) -> np.ndarray:
+        """Returns a uint8 array sharing memory with the packed bits."""
+
+        return np.frombuffer(self._bits, dtype=np.uint8)
+
+    def __contains__(self, index: int) -> bool:
+        return bool(self._bits[index >> 3] >> (index & 7) & 1)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[int]:
+        for byte_index in np.flatnonzero(self.array()).tolist():
+            byte = self._bits[byte_index]
+            for bit in range(8):
+                if byte >> bit & 1:
+                    yield (byte_index << 3) + bit
+
+    def add(self, index: int) -> None:
+        mask = 1 << (index & 7)
+        if not self._bits[index >> 3] & mask:
+            self._bits[index >> 3] |= mask
+            self._count += 1
+
+    def discard(self, index: int) -> None:
+        mask = 1 << (index & 7)
+        if self._bits[index >> 3] & mask:
+            self._bits[index >> 3] &= ~mask & 0xFF
+            self._count -= 1
+
+    def clear(self) -> None:
+        self.array()[:] = 0
+        self._count = 0
+
+    def unpack(self, start: int, stop: int) -> np.ndarray:
+        """Returns the bits for indices start to stop as a boolean array."""
+
+        first_byte, last_byte = start >> 3, (stop + 7) >> 3
+        bits = np.unpackbits(self.array()[first_byte:last_byte], bitorder="little")
+        offset = start - (first_byte << 3)
+        return bits[offset:offset + stop - start].astype(bool)
+
+
+class CoordinateBitSet(MutableSet):
+    """A set of Coordinates backed by a BitSet of row-major cell indices."""
+
+    def __init__(self, bits: BitSet, width: int, height: int):
+        """
+        :param bits: The BitSet holding the cell indices
+        :param width: The horizontal span of the array
+        :param height: The vertical span of the array
+        """
+        self._bits = bits
+        self._width = width
+        self._height = height
+
+    @property
+    def bits(self) -> BitSet:
+        return self._bits
+
+    def __contains__(self, coord) -> bool:
+        row, col = coord
+        if 0 <= row < self._height and 0 <= col < self._width:
+            return row * self._width + col in self._bits
+        return False
+
+    def __len__(self) -> int:
+        return len(self._bits)
+
+    def __iter__(self) -> Iterator[Coordinate]:
+        width = self._width
+        for index in self._bits:
+            yield from_index(index, width)
+
+    def add(self, coord: Coordinate) -> None:
+        self._bits.add(coord.row * self._width + coord.col)
+
+    def discard(self, coord: Coordinate) -> None:
+        if coord in self:
+            self._bits.discard(coord.row * self._width + coord.col)
+
+
+def coordinate_bits(cells, width: int, height: int) -> BitSet:
+    """Returns a set of Coordinates as a BitSet of row-major cell indices. Shares the bits of a CoordinateBitSet."""
+
+    if isinstance(cells, CoordinateBitSet):
+        return cells.bits
+    bits = BitSet(width * height)
+    for coord in cells:
+        bits.add(coord.row * width + coord.col)
+    return bits
@@ -1,15 +1,20 @@
-from typing import Set, List
+from typing import AbstractSet, Iterable, Set, List, Optional
 from collections import namedtuple
-from itertools import product
-from random import sample
+import random
+from random import Random
 
-from coordinate import Coordinate
-from cellEntry import Entry, EntryValue
-from getAdjacent import get_adjacent
+from bitset import BitSet
+from coordinate import Coordinate, from_index
+from cellEntry import COUNT_ENTRIES, Entry, EntryValue
+from minePlacement import sample_mine_indices
+from neighbors import NeighborTable, neighbor_table
+from zeroRegions import ZeroRegionIndex
 
 
 class GameState:
 
+    __slots__ = ("finished", "win", "loss")
+
     def __init__(self, finished=False, win=False, loss=False):
         self.finished = finished
         self.win = win
@@ -30,65 +35,166 @@ class GameState:
 class Board:
     """Creates an array of dimensions width by height and adds mines to it."""
 
-    def __init__(self, width: int, height: int, num_mines: int):
+    # Whether the zero regions are indexed when the layout is generated
+    index_zero_regions = True
+
+    # Whether place_mines can replace the layout and mine_bitset can read it whole, as move logs need
+    replaceable_layout = True
+
+    def __init__(self, width: int, height: int, num_mines: int, safe_first_click: bool = False, seed: int = None):
         """
         :param width: The horizontal span of the array
         :param height: The vertical span of the array
         :param num_mines: The number of mines to be seeded
+        :param safe_first_click: Wait for the first revealed cell before placing mines, keeping them out of its 3x3 area
+        :param seed: Seed of the board's own random generator. Uses the global random state if None
         """
         self._width = width
         self._height = height
         self._total_cells = self._width * self._height
         self._num_mines = num_mines
+        self._neighbors = neighbor_table(width, height)
         self._mines_left = num_mines
         self._wins = 0
         self._losses = 0
-        self._cells_revealed = set()
-        self._cells_flagged = set()
+        self._cells_revealed = None
+        self._cells_flagged = None
+        self._num_revealed = 0
+        self._num_flagged = 0
         self._game_state = GameState()
         self._grid = None
+        self._zero_regions = None
+        self._safe_first_click = safe_first_click
+        self._generated = False
+        self._seed = seed
+        self._random = self._create_random()
         self._init_game_board()
 
     def _init_game_board(self) -> None:
+        self._clear_cells()
+        self._generated = False
+        if not self._safe_first_click:
+            self._generate_layout()
+
+    def reset(self) -> None:
+        self._clear_cells()
+        self._generated = False
+        if not self._safe_first_click:
+            self._generate_layout()
+        self._game_state.reset_game_state()
+
+    def _generate_layout(self, excluded: AbstractSet[int] = frozenset()) -> None:
+        """Creates the grid, adds mines outside the excluded cell indices and counts adjacent mines."""
+
         self._create_grid()
-        self._add_mines()
+        self._add_mines(excluded)
         self._set_adjacent_mine_count()
+        self._index_zero_regions()
+        self._generated = True
 
-    def reset(self) -> None:
-        self._cells_revealed = set()
-        self._cells_flagged = set()
-        self._mines_left = self._num_mines
+    def place_mines(self, indices: Iterable[int]) -> None:
+        """Replaces the layout with mines at the given row-major cell indices, such as a layout read from a log.
+
+        Raises ValueError unless there are exactly num_mines distinct indices.
+        """
+        indices = set(indices)
+        if len(indices) != self._num_mines:
+            raise ValueError("Expected {} mines, got {}".format(self._num_mines, len(indices)))
         self._create_grid()
-        self._add_mines()
+        mine = Entry.of(EntryValue.MINE)
+        for index in indices:
+            self.set_cell(from_index(index, self._width), mine)
         self._set_adjacent_mine_count()
-        self._game_state.reset_game_state()
+        self._index_zero_regions()
+        self._generated = True
+
+    @property
+    def generated(self) -> bool:
+        """Whether the mines have been placed."""
+
+        return self._generated
+
+    def generate(self, first_click: Coordinate) -> None:
+        """Places the mines away from the first revealed cell and its adjacent cells.
+
+        Falls back to only sparing the clicked cell when the board is too full.
+        """
+
+        clicked = first_click.row * self._width + first_click.col
+        area = [clicked] + [clicked + offset for offset in self._neighbors.offsets(first_click.row, first_click.col)]
+        if self._total_cells - len(area) < self._num_mines:
+            area = [clicked] if self._total_cells > self._num_mines else []
+        self._generate_layout(set(area))
+
+    def _create_random(self):
+        """Returns the random generator used to place mines."""
+
+        return random if self._seed is None else Random(self._seed)
+
+    def _clear_cells(self) -> None:
+        """Hides every cell and removes every flag."""
+
+        self._create_cell_sets()
+        self._num_revealed = 0
+        self._num_flagged = 0
+        self._mines_left = self._num_mines
+
+    def _create_cell_sets(self) -> None:
+        """Creates empty sets of revealed and flagged cells."""
+
+        self._cells_revealed = set()
+        self._cells_flagged = set()
 
     def _create_grid(self) -> None:
         """Creates a grid of elements Entry objects with null values."""
 
-        self._grid = [[Entry(EntryValue.NULL)] * self._width for _ in range(self._height)]
+        self._grid = [[Entry.of(EntryValue.NULL)] * self._width for _ in range(self._height)]
 
-    def _add_mines(self) -> None:
-        """Randomly adds mines to board grid."""
+    def _add_mines(self, excluded: AbstractSet[int] = frozenset()) -> None:
+        """Randomly adds mines to board grid, skipping the excluded cell indices."""
 
-        for col, row in sample(list(product(range(self._width), range(self._height))), self._num_mines):
-            self._grid[row][col] = Entry(EntryValue.MINE)
+        mine = Entry.of(EntryValue.MINE)
+        for index in sample_mine_indices(self._total_cells, self._num_mines, self._random, excluded):
+            row, col = divmod(index, self._width)
+            self._grid[row][col] = mine
 
     def _set_adjacent_mine_count(self) -> None:
         """Sets cell Entry values to the number of their adjacent mines."""
 
-        for r in range(len(self._grid)):
-            for c in range(len(self._grid[0])):
-                coord = Coordinate(r, c)
-                if not self.get_cell_entry(coord).isMine():
-                    mine_count_array = [self.get_cell_entry(index).isMine(
-                    ) for index in get_adjacent(coord) if self.is_valid_cell(index)]
-                    num_mines = sum(mine_count_array)
-                    entry_value = EntryValue(num_mines)
-                    self.set_cell(coord, Entry(entry_value))
+        width = self._width
+        # Mine flags as ints, padded with a zero column on both sides
+        mine_rows = [[0] + [int(entry.isMine()) for entry in row] + [0] for row in self._grid]
+        blank = [0] * (width + 2)
+        for r, row in enumerate(self._grid):
+            above = mine_rows[r - 1] if r > 0 else blank
+            below = mine_rows[r + 1] if r + 1 < self._height else blank
+            # Mines in each 3 cell column: above, own and below row
+            columns = [a + m + b for a, m, b in zip(above, mine_rows[r], below)]
+            own = mine_rows[r]
+            for c in range(width):
+                if not own[c + 1]:
+                    row[c] = COUNT_ENTRIES[columns[c] + columns[c + 1] + columns[c + 2]]
+
+    def _index_zero_regions(self) -> None:
+        """Finds the regions revealed by each zero cell of the new layout."""
+
+        self._zero_regions = ZeroRegionIndex(self) if self.index_zero_regions else None
+
+    def zero_region(self, coord: Coordinate) -> Optional[List[Coordinate]]:
+        """Returns the cells revealed along with a zero cell, or None if the board has no index."""
+
+        if self._zero_regions is None:
+            return None
+        return self._zero_regions.region(coord)
 
     def update_mines_left(self) -> None:
-        self._mines_left = self._num_mines - len(self.cells_flagged())
+        self._mines_left = self._num_mines - self._num_flagged
+
+    def update_game_state(self) -> None:
+        """Declares a win once only the mines are hidden, unless the game is already over."""
+
+        if self._total_cells - self._num_revealed == self._num_mines and not self._game_state.finished:
+            self._game_state.set_game_state(True, True, False)
 
     @property
     def game_state(self) -> str:
@@ -102,10 +208,40 @@ class Board:
     def losses(self):
         return self._losses
     
+    @property
+    def width(self):
+        return self._width
+
+    @property
+    def height(self):
+        return self._height
+
+    @property
+    def neighbors(self) -> NeighborTable:
+        """The shared neighbor table of the board's shape."""
+
+        return self._neighbors
+
+    @property
+    def seed(self):
+        return self._seed
+
+    @property
+    def num_mines(self):
+        return self._num_mines
+
     @property
     def mines_left(self):
         return self._mines_left
 
+    @property
+    def num_revealed(self) -> int:
+        return self._num_revealed
+
+    @property
+    def num_flagged(self) -> int:
+        return self._num_flagged
+
     def increment_wins(self) -> None:
         self._wins += 1
 
@@ -116,15 +252,38 @@ class Board:
         return self._game_state
 
     def add_to_revealed_cells(self, coord: Coordinate) -> None:
+        """Reveals a cell. Revealing a mine loses the game and revealing the last safe cell wins it."""
+
+        if coord in self._cells_revealed:
+            return
         self._cells_revealed.add(coord)
+        self._num_revealed += 1
+        if self._game_state.finished:
+            return
+        if self.get_cell_value(coord).isMine():
+            self._game_state.set_game_state(True, False, True)
+        else:
+            self.update_game_state()
+
+    def remove_from_revealed_cells(self, coord: Coordinate) -> bool:
+        """Hides a revealed cell again. The game state is left to the caller."""
+
+        if coord in self._cells_revealed:
+            self._cells_revealed.remove(coord)
+            self._num_revealed -= 1
+            return True
+        return False
 
     def add_to_cells_flagged(self, coord: Coordinate) -> None:
-        self._cells_flagged.add(coord)
-        self.update_mines_left()
+        if coord not in self._cells_flagged:
+            self._cells_flagged.add(coord)
+            self._num_flagged += 1
+            self.update_mines_left()
 
     def remove_from_cells_flagged(self, coord: Coordinate) -> bool:
         if coord in self._cells_flagged:
             self._cells_flagged.remove(coord)
+            self._num_flagged -= 1
             self.update_mines_left()
             return True
         return False
@@ -140,7 +299,13 @@ class Board:
     def get_cell_value(self, coord: Coordinate) -> EntryValue:
         """Returns EntryValue at the given index."""
 
-        return self.get_cell_entry(coord).value
+        return self._grid[coord.row][coord.col].value
+
+    def mine_bitset(self) -> BitSet:
+        """Returns the mine layout as a BitSet of row-major cell indices. It may share storage with the board."""
+
+        return BitSet.from_mask([self.get_cell_value(Coordinate(row, col)).isMine()
+                                 for row in range(self._height) for col in range(self._width)])
 
     def is_valid_cell(self, coordinate) -> None:
         return (0 <= coordinate.row <= self._height - 1) and (0 <= coordinate.col <= self._width - 1)
@@ -163,3 +328,9 @@ class Board:
             result.append(" ".join(row_str))
         for i in result:
             print(i)
+
+    def _print_cell_values(self) -> None:
+        """Prints the cell values one row per line, reading each cell through get_cell_value."""
+
+        for row in range(self._height):
+            print(" ".join(str(self.get_cell_value(Coordinate(row, col)).value) for col in range(self._width)))
@@ -13,34 +13,64 @@ class EntryValue(Enum):
     EIGHT = 8
     NULL = None
 
+    # The predicates read flags precomputed for each member below
     def isNum(self):
-        return type(self.value) is int and self.value >= 0
+        return self._is_num
     
     def is_num_and_g_t_zero(self):
-        return type(self.value) is int and self.value > 0
+        return self._is_positive
 
     def isZero(self):
-        return self.value == 0
+        return self._is_zero
     
     def isMine(self):
-        return self.value == -1
+        return self._is_mine
+
+    @staticmethod
+    def from_count(count: int) -> "EntryValue":
+        """Returns the value of a cell with count adjacent mines. Faster than EntryValue(count)."""
+
+        return _COUNT_VALUES[count]
 
 
 class Entry:
-    """The Object contained in each Board row and column"""
+    """The Object contained in each Board row and column
+
+    Entries are immutable, so boards share the one returned by Entry.of for each value.
+    """
+
+    __slots__ = ("_value",)
 
     def __init__(self, value: EntryValue):
         if type(value) != EntryValue:
             raise TypeError
         self._value = value
+
+    @staticmethod
+    def of(value: EntryValue) -> "Entry":
+        """Returns the shared Entry holding value."""
+
+        return value._entry
     
     @property
     def value(self):
         return self._value
 
     def isMine(self) -> bool:
-        return self.value == EntryValue.MINE
+        return self._value._is_mine
 
     def __str__(self):
         return str(self.value)
 
+
+for _member in EntryValue:
+    _member._is_num = type(_member.value) is int and _member.value >= 0
+    _member._is_positive = type(_member.value) is int and _member.value > 0
+    _member._is_zero = _member.value == 0
+    _member._is_mine = _member.value == -1
+    _member._entry = Entry(_member)
+
+_COUNT_VALUES = tuple(EntryValue(count) for count in range(9))
+
+# Shared entries of the cells with 0 to 8 adjacent mines
+COUNT_ENTRIES = tuple(Entry.of(value) for value in _COUNT_VALUES)
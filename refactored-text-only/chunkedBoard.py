@@ -0,0 +1,191 @@
+from random import Random
+from typing import AbstractSet, Dict, Iterable, Tuple
+
+from board import Board
+from coordinate import Coordinate
+from cellEntry import Entry, EntryValue
+
+
+# Marks an adjacent mine count that has not been computed yet
+_UNKNOWN = 0xFF
+
+# EntryValue for each adjacent mine count
+_COUNT_VALUES = [EntryValue(value) for value in range(9)]
+
+
+class Chunk:
+    """A square block of cells. Holds its mines and the counts computed so far."""
+
+    __slots__ = ("mines", "counts")
+
+    def __init__(self, size: int, rng: Random, num_mines: int, excluded: AbstractSet[int] = frozenset()):
+        """
+        :param size: The horizontal and vertical span of the chunk
+        :param rng: The chunk's own random generator
+        :param num_mines: The number of mines to be seeded in the chunk
+        :param excluded: Indices inside the chunk that must not hold a mine. Ignored if too few cells are left
+        """
+        self.mines = bytearray(size * size)
+        cells = range(size * size)
+        if excluded and size * size - len(excluded) >= num_mines:
+            cells = [index for index in cells if index not in excluded]
+        for index in rng.sample(cells, num_mines):
+            self.mines[index] = 1
+        self.counts = bytearray([_UNKNOWN]) * (size * size)
+
+
+class ChunkedBoard(Board):
+    """Board divided into square chunks that are generated on first access.
+
+    Every chunk gets its mines from a seed derived from the board seed, the
+    game number and the chunk position, so the layout is the same no matter
+    in which order chunks are visited. Adjacent mine counts are computed per
+    cell when first read, looking into neighboring chunks at the borders.
+    Boards can be made practically infinite since untouched chunks are never
+    allocated.
+    """
+
+    index_zero_regions = False
+
+    replaceable_layout = False
+
+    def __init__(self, width: int, height: int, num_mines: int, chunk_size: int = 32, seed: int = 0,
+                 safe_first_click: bool = False):
+        """
+        :param width: The horizontal span of the array. A multiple of chunk_size
+        :param height: The vertical span of the array. A multiple of chunk_size
+        :param num_mines: The number of mines to be seeded, spread evenly over the chunks
+        :param chunk_size: The horizontal and vertical span of a chunk
+        :param seed: The seed every chunk layout is derived from
+        :param safe_first_click: Keep mines out of the first revealed cell's 3x3 area
+        """
+        if width % chunk_size or height % chunk_size:
+            raise ValueError("Board dimensions must be multiples of the chunk size")
+        self._chunk_size = chunk_size
+        self._chunks_across = width // chunk_size
+        num_chunks = self._chunks_across * (height // chunk_size)
+        # Every chunk gets mines_per_chunk mines and the first extra_mines chunks one more
+        self._mines_per_chunk, self._extra_mines = divmod(num_mines, num_chunks)
+        if self._mines_per_chunk + (self._extra_mines > 0) > chunk_size * chunk_size:
+            raise ValueError("More mines than cells in a chunk")
+        self._seed = seed
+        self._game = 0
+        self._chunks = {}
+        self._excluded = frozenset()
+        super().__init__(width, height, num_mines, safe_first_click=safe_first_click, seed=seed)
+
+    def reset(self) -> None:
+        self._game += 1
+        super().reset()
+
+    def _create_grid(self) -> None:
+        """Drops every generated chunk."""
+
+        self._chunks = {}
+
+    def _add_mines(self, excluded: AbstractSet[int] = frozenset()) -> None:
+        """Mines are added when a chunk is generated. Remembers the excluded cell indices for then."""
+
+        self._excluded = frozenset(excluded)
+
+    def _set_adjacent_mine_count(self) -> None:
+        """Counts are computed when a cell is first read."""
+
+    def place_mines(self, indices: Iterable[int]) -> None:
+        """Chunk layouts always come from the chunk seeds. Raises TypeError."""
+
+        raise TypeError("ChunkedBoard layouts come from the chunk seeds and cannot be replaced")
+
+    @property
+    def chunks(self) -> Dict[Tuple[int, int], Chunk]:
+        """Generated chunks keyed by (chunk row, chunk column)."""
+
+        return self._chunks
+
+    def _get_chunk(self, chunk_row: int, chunk_col: int) -> Chunk:
+        """Returns the chunk at the given chunk position, generating it if needed."""
+
+        chunk = self._chunks.get((chunk_row, chunk_col))
+        if chunk is None:
+            rng = Random("{}:{}:{}:{}".format(self._seed, self._game, chunk_row, chunk_col))
+            num_mines = self._mines_per_chunk + (chunk_row * self._chunks_across + chunk_col < self._extra_mines)
+            chunk = Chunk(self._chunk_size, rng, num_mines, self._excluded_in_chunk(chunk_row, chunk_col))
+            self._chunks[(chunk_row, chunk_col)] = chunk
+        return chunk
+
+    def _excluded_in_chunk(self, chunk_row: int, chunk_col: int) -> AbstractSet[int]:
+        """Returns the excluded cells inside a chunk as indices within the chunk."""
+
+        size = self._chunk_size
+        excluded = set()
+        for index in self._excluded:
+            row, col = divmod(index, self._width)
+            local_row, local_col = row - chunk_row * size, col - chunk_col * size
+            if 0 <= local_row < size and 0 <= local_col < size:
+                excluded.add(local_row * size + local_col)
+        return excluded
+
+    def _locate(self, row: int, col: int) -> Tuple[Chunk, int]:
+        """Returns the chunk holding a cell and the cell's index inside it."""
+
+        if not (0 <= row < self._height and 0 <= col < self._width):
+            raise IndexError("Cell ({}, {}) is outside the board".format(row, col))
+        chunk_row, local_row = divmod(row, self._chunk_size)
+        chunk_col, local_col = divmod(col, self._chunk_size)
+        return self._get_chunk(chunk_row, chunk_col), local_row * self._chunk_size + local_col
+
+    def _is_mine(self, row: int, col: int) -> bool:
+        if not (0 <= row < self._height and 0 <= col < self._width):
+            return False
+        chunk, index = self._locate(row, col)
+        return chunk.mines[index] == 1
+
+    def set_cell(self, coord: Coordinate, entry: Entry) -> None:
+        """Sets a cell. Adding or removing a mine clears the cached counts around it."""
+
+        chunk, index = self._locate(coord.row, coord.col)
+        is_mine = entry.isMine()
+        if chunk.mines[index] != is_mine:
+            chunk.mines[index] = is_mine
+            self._forget_adjacent_counts(coord.row, coord.col)
+        if not is_mine:
+            chunk.counts[index] = entry.value.value
+
+    def _forget_adjacent_counts(self, row: int, col: int) -> None:
+        """Marks the counts of the cells around a cell as unknown, in generated chunks only."""
+
+        for row_step, col_step in self.neighbors.steps(row, col):
+            chunk_row, local_row = divmod(row + row_step, self._chunk_size)
+            chunk_col, local_col = divmod(col + col_step, self._chunk_size)
+            chunk = self._chunks.get((chunk_row, chunk_col))
+            if chunk is not None:
+                chunk.counts[local_row * self._chunk_size + local_col] = _UNKNOWN
+
+    def get_cell_entry(self, coord: Coordinate) -> Entry:
+        """Returns Entry object at the given index."""
+
+        return Entry.of(self.get_cell_value(coord))
+
+    def get_cell_value(self, coord: Coordinate) -> EntryValue:
+        """Returns EntryValue at the given index."""
+
+        row, col = coord
+        chunk, index = self._locate(row, col)
+        if chunk.mines[index]:
+            return EntryValue.MINE
+        count = chunk.counts[index]
+        if count == _UNKNOWN:
+            count = sum(self._is_mine(row + row_offset, col + col_offset)
+                        for row_offset in (-1, 0, 1) for col_offset in (-1, 0, 1))
+            chunk.counts[index] = count
+        return _COUNT_VALUES[count]
+
+    def print(self) -> None:
+        """Prints every generated chunk."""
+
+        for (chunk_row, chunk_col) in sorted(self._chunks):
+            print("Chunk ({}, {})".format(chunk_row, chunk_col))
+            top, left = chunk_row * self._chunk_size, chunk_col * self._chunk_size
+            for row in range(top, top + self._chunk_size):
+                print(" ".join(str(self.get_cell_value(Coordinate(row, col)).value)
+                               for col in range(left, left + self._chunk_size)))
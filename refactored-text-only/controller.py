@@ -1,27 +1,39 @@
 from collections import deque as Deque
 
-from typing import List, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple, Type
 
-from getAdjacent import get_adjacent
 from board import Board, GameState
 from coordinate import Coordinate
 from cellEntry import Entry, EntryValue
+from history import Move, depth
 
 
 class Controller:
     """Sets up minesweeper game logic."""
 
-    def __init__(self, width: int, height: int, num_mines: int):
+    def __init__(self, width: int, height: int, num_mines: int, board_class: Type[Board] = Board, seed: int = None):
         """
         :param width: The horizontal span of the array
         :param height: The vertical span of the array
         :param num_mines: The number of mines to be seeded
+        :param board_class: The Board implementation holding the game grid
+        :param seed: Seed for reproducible boards. The board class decides its default if None
         """
         self.width = width
         self.height = height
         self._num_mines = num_mines
         self._total_cells = self.width * self.height
-        self.board = Board(self.width, self.height, self._num_mines)
+        board_options = {} if seed is None else {"seed": seed}
+        self.board = board_class(self.width, self.height, self._num_mines, **board_options)
+        self._last_move = None
+        self._undone = []
+        self._snapshots = {}
+
+    @classmethod
+    def from_board(cls, board: Board) -> "Controller":
+        """Returns a Controller playing on an existing board, such as one loaded from a save file."""
+
+        return cls(board.width, board.height, board.num_mines, board_class=lambda *args, **kwargs: board)
 
     def get_wins(self) -> int:
         return self.board.wins
@@ -42,34 +54,40 @@ class Controller:
         return self.board.mines_left
 
     def update_game_state(self) -> None:
-        cells_unrevealed = self._total_cells - self.num_cells_revealed()
-        if cells_unrevealed == self._num_mines:
-            self.get_game_state().set_game_state(True, True, False)
+        """The board keeps its game state up to date as cells are revealed. Kept for existing callers."""
+
+        self.board.update_game_state()
 
     def num_cells_revealed(self) -> int:
-        return len(self.board.cells_revealed())
+        return self.board.num_revealed
 
     def reset(self) -> None:
-        """Resets the game"""
+        """Resets the game. The move history and snapshots are cleared."""
 
         self.board.reset()
+        self._last_move = None
+        self._undone = []
+        self._snapshots = {}
 
     def reveal_decision(self, index: Coordinate) -> List[Tuple[Coordinate, EntryValue]]:
         """Main decision method determining how to reveal cell."""
 
+        if not self.board.generated:
+            self.board.generate(index)
+        state_before = self._state()
         cell_value = self.board.get_cell_value(index)
         result = None
-        if index in self.board.cells_flagged().union(self.board.cells_revealed()):
+        if index in self.board.cells_flagged() or index in self.board.cells_revealed():
             result = []
         elif cell_value.isZero():
             result = self.reveal_zeroes(index)
         elif cell_value.isNum():
             result = [self.reveal_cell(index, cell_value)]
         else:
-            # Found mine. Game over
-            self.board.get_game_state().set_game_state(True, False, False)
+            # Found mine. Revealing it ends the game
             result = [self.reveal_cell(index, cell_value)]
-        self.update_game_state()
+        if result:
+            self._record(state_before, revealed=[coord for coord, _ in result])
         return result
 
     def reveal_cell(self, index: Coordinate, value: EntryValue) -> Tuple[Coordinate, EntryValue]:
@@ -82,6 +100,18 @@ class Controller:
     def reveal_zeroes(self, index: Coordinate) -> List[Tuple[Coordinate, EntryValue]]:
         """Reveals all adjacent cells if the current Entry has a zero value."""
 
+        region = self.board.zero_region(index)
+        if region is None:
+            return self.reveal_zeroes_bfs(index)
+        result = []
+        for cell in region:
+            if cell not in self.board.cells_flagged() and cell not in self.board.cells_revealed():
+                result.append(self.reveal_cell(cell, self.board.get_cell_value(cell)))
+        return result
+
+    def reveal_zeroes_bfs(self, index: Coordinate) -> List[Tuple[Coordinate, EntryValue]]:
+        """Reveals the zero region around a cell by searching the board. Used by boards without a zero region index."""
+
         # result = []
         # DFS -> Uses call stack
         # def reveal_helper(index: Coordinate) -> None:
@@ -98,31 +128,27 @@ class Controller:
         #                 reveal_helper(coord)
         # reveal_helper(index)
 
-        # BFS
+        # BFS. Flagged cells are searched through but stay hidden
         queue = Deque()
         queue.appendleft(index)
         result = []
-        isBeingExplored = set()
- 
+        visited = {index}
+        steps = self.board.neighbors.steps
+        cells_revealed = self.board.cells_revealed()
+
         while queue:
             cell = queue.pop()
             val = self.board.get_cell_value(cell)
-            if val.is_num_and_g_t_zero(): # val > 0
-                if cell in isBeingExplored:
-                    isBeingExplored.remove(cell)
-                result.append(self.reveal_cell(cell, val))
-            else:  # val == 0
-                for coord in get_adjacent(cell):
-                    if (
-                        self.board.is_valid_cell(coord) 
-                        and coord not in self.board.cells_revealed() 
-                        and coord not in isBeingExplored
-                    ):
-                        isBeingExplored.add(coord)          
+            if val.isZero():
+                row, col = cell
+                for row_step, col_step in steps(row, col):
+                    coord = Coordinate(row + row_step, col + col_step)
+                    if coord not in cells_revealed and coord not in visited:
+                        visited.add(coord)
                         queue.appendleft(coord)
-                if cell in isBeingExplored:
-                    isBeingExplored.remove(cell)
-                result.append(self.reveal_cell(cell, val))
+            revealed = self.reveal_cell(cell, val)
+            if revealed is not None:
+                result.append(revealed)
 
         return result
 
@@ -130,20 +156,120 @@ class Controller:
         """Adds or removes cell from flagged cells. Returns int indicating view to flag or unflag cell."""
         if index in self.board.cells_revealed():
             return 0  # Don't flag cell
+        state_before = self._state()
         if index not in self.board.cells_flagged():
             self.board.add_to_cells_flagged(index)
+            self._record(state_before, flagged=[index])
             return 1  # Flag cell
         else:
             self.board.remove_from_cells_flagged(index)
+            self._record(state_before, unflagged=[index])
             return -1  # Unflag cell
 
     def reveal_all_cells(self) -> List[Tuple[Coordinate, EntryValue]]:
         result = []
+        state_before = self._state()
+        revealed = self.board.cells_revealed()
+        newly_revealed = []
 
         for row in range(self.height):
             for col in range(self.width):
                 coord = Coordinate(row, col)
                 cell_value = self.board.get_cell_value(coord)
-                self.board.add_to_revealed_cells(coord)
+                if coord not in revealed:
+                    newly_revealed.append(coord)
+                    self.board.add_to_revealed_cells(coord)
                 result.append((coord, cell_value))
+        if newly_revealed:
+            self._record(state_before, revealed=newly_revealed)
         return result
+
+    def _state(self) -> Tuple[bool, bool, bool]:
+        game_state = self.board.get_game_state()
+        return game_state.finished, game_state.win, game_state.loss
+
+    def _record(self, state_before: Tuple[bool, bool, bool], revealed: Iterable[Coordinate] = (),
+                flagged: Iterable[Coordinate] = (), unflagged: Iterable[Coordinate] = ()) -> None:
+        """Adds a move after the current one. Moves undone so far can no longer be redone."""
+
+        self._last_move = Move(tuple(revealed), tuple(flagged), tuple(unflagged), state_before, self._state(),
+                               self._last_move, depth(self._last_move) + 1)
+        self._undone = []
+
+    def _unapply(self, move: Move) -> None:
+        for coord in move.revealed:
+            self.board.remove_from_revealed_cells(coord)
+        for coord in move.flagged:
+            self.board.remove_from_cells_flagged(coord)
+        for coord in move.unflagged:
+            self.board.add_to_cells_flagged(coord)
+        self.board.get_game_state().set_game_state(*move.state_before)
+
+    def _apply(self, move: Move) -> None:
+        for coord in move.revealed:
+            self.board.add_to_revealed_cells(coord)
+        for coord in move.flagged:
+            self.board.add_to_cells_flagged(coord)
+        for coord in move.unflagged:
+            self.board.remove_from_cells_flagged(coord)
+        self.board.get_game_state().set_game_state(*move.state_after)
+
+    @property
+    def last_move(self) -> Optional[Move]:
+        """The most recent move that has not been undone, or None at the start of the game."""
+
+        return self._last_move
+
+    def undo(self) -> Optional[Move]:
+        """Takes back the last move. Returns it so views can hide and unflag its cells, or None if there is none."""
+
+        move = self._last_move
+        if move is None:
+            return None
+        self._unapply(move)
+        self._last_move = move.parent
+        self._undone.append(move)
+        return move
+
+    def redo(self) -> Optional[Move]:
+        """Plays the last undone move again. Returns it, or None if there is none."""
+
+        if not self._undone:
+            return None
+        move = self._undone.pop()
+        self._apply(move)
+        self._last_move = move
+        return move
+
+    def snapshot(self, name: str) -> None:
+        """Remembers the current position under a name. Takes constant time."""
+
+        self._snapshots[name] = self._last_move
+
+    def snapshots(self) -> Dict[str, Optional[Move]]:
+        return dict(self._snapshots)
+
+    def restore(self, name: str) -> None:
+        """Returns to a named position, also across branches of play.
+
+        Only the moves between the two positions are undone and replayed.
+        Raises KeyError for an unknown name.
+        """
+        target = self._snapshots[name]
+        current = self._last_move
+        replay = []
+        while depth(current) > depth(target):
+            self._unapply(current)
+            current = current.parent
+        while depth(target) > depth(current):
+            replay.append(target)
+            target = target.parent
+        while current is not target:
+            self._unapply(current)
+            current = current.parent
+            replay.append(target)
+            target = target.parent
+        for move in reversed(replay):
+            self._apply(move)
+        self._last_move = self._snapshots[name]
+        self._undone = []
@@ -1,4 +1,20 @@
 from collections import namedtuple
 
 
-Coordinate = namedtuple('Coordinate', ['row', 'col'])
\ No newline at end of file
+Coordinate = namedtuple('Coordinate', ['row', 'col'])
+
+# Builds a Coordinate from a (row, col) tuple without the Python level Coordinate.__new__:
+# new_coordinate(Coordinate, (row, col))
+new_coordinate = tuple.__new__
+
+
+def from_index(index: int, width: int) -> Coordinate:
+    """Returns the Coordinate of a row-major cell index."""
+
+    return new_coordinate(Coordinate, divmod(index, width))
+
+
+def to_index(coord: Coordinate, width: int) -> int:
+    """Returns the row-major index of a Coordinate."""
+
+    return coord.row * width + coord.col
@@ -0,0 +1,276 @@
+"""
+Generates large corpora of boards in parallel and reads them back lazily.
+
+    python corpus.py --width 30 --height 16 --mines 99 --boards 1000000 --workers 8 --seed 1 boards.mswc
+
+A corpus file holds a header, an index and one fixed size record per
+board. All fields are little-endian:
+
+    header   magic b"MSWC", uint16 version, uint16 header size, uint64 width,
+             uint64 height, uint64 num mines, uint64 num boards, uint64 seed,
+             uint64 record size
+    index    uint64 file offset of each record
+    record   mine bitset of (width * height + 7) // 8 bytes, then the adjacent
+             mine counts of (width * height + 1) // 2 bytes
+
+Bitsets use the layout of saveFile and the counts the 4 bit packing of
+BitBoard, so boards are read without any decoding. Boards are generated a
+chunk at a time, each chunk from its own stream spawned from the master
+seed, so a corpus depends only on its seed and dimensions, never on the
+number of workers.
+"""
+
+import argparse
+import os
+import struct
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List
+
+import numpy as np
+
+from bitBoard import BitBoard
+from bitset import BitSet
+
+
+MAGIC = b"MSWC"
+
+FORMAT_VERSION = 1
+
+# Boards of a chunk are generated with array operations over about this many cells
+_CHUNK_CELLS = 1 << 20
+
+_HEADER = struct.Struct("<4sHHQQQQQQ")
+
+
+def _chunk_boards(width: int, height: int) -> int:
+    return max(1, _CHUNK_CELLS // (width * height))
+
+
+def _record_sizes(width: int, height: int):
+    """Returns the sizes of the mine bitset and of the packed counts of a record."""
+
+    total_cells = width * height
+    return (total_cells + 7) // 8, (total_cells + 1) // 2
+
+
+def generate_records(width: int, height: int, num_mines: int, num_boards: int,
+                     rng: np.random.Generator) -> np.ndarray:
+    """Returns the records of num_boards random boards as a uint8 array of shape (num_boards, record size)."""
+
+    total_cells = width * height
+    keys = rng.random((num_boards, total_cells))
+    mines = np.zeros((num_boards, total_cells), dtype=bool)
+    if num_mines:
+        chosen = np.argpartition(keys, num_mines - 1, axis=1)[:, :num_mines]
+        np.put_along_axis(mines, chosen, True, axis=1)
+    # Adjacent mines of each cell, counting the cell itself, which only matters for mines
+    padded = np.pad(mines.reshape(num_boards, height, width), ((0, 0), (1, 1), (1, 1))).astype(np.uint8)
+    counts = np.zeros((num_boards, height, width), dtype=np.uint8)
+    for row_offset in range(3):
+        for col_offset in range(3):
+            counts += padded[:, row_offset:row_offset + height, col_offset:col_offset + width]
+    counts = counts.reshape(num_boards, total_cells)
+    if total_cells % 2:
+        counts = np.pad(counts, ((0, 0), (0, 1)))
+    return np.concatenate([np.packbits(mines, axis=1, bitorder="little"), counts[:, 0::2] | counts[:, 1::2] << 4],
+                          axis=1)
+
+
+def _write_chunk(path: str, records_offset: int, width: int, height: int, num_mines: int, num_boards: int,
+                 chunk: int, seed_sequence: np.random.SeedSequence) -> int:
+    """Generates one chunk of boards into the corpus file. Runs inside a worker process."""
+
+    chunk_boards = _chunk_boards(width, height)
+    first = chunk * chunk_boards
+    count = min(chunk_boards, num_boards - first)
+    records = generate_records(width, height, num_mines, count, np.random.default_rng(seed_sequence))
+    output = np.memmap(path, dtype=np.uint8, mode="r+", offset=records_offset + first * records.shape[1],
+                       shape=records.shape)
+    output[:] = records
+    output.flush()
+    return count
+
+
+def generate_corpus(path: str, width: int, height: int, num_mines: int, num_boards: int, seed: int = 0,
+                    workers: int = 1) -> None:
+    """Writes num_boards random boards to a corpus file.
+
+    The file is written next to path and then moved over it, so a failed run never leaves a partial corpus.
+
+    :param path: The corpus file
+    :param width: The horizontal span of the array
+    :param height: The vertical span of the array
+    :param num_mines: The number of mines on each board
+    :param num_boards: The number of boards to generate
+    :param seed: Master seed, a non-negative integer
+    :param workers: The number of worker processes. 1 generates in this process
+    """
+    if num_mines > width * height:
+        raise ValueError("More mines than cells")
+    if seed < 0:
+        raise ValueError("The seed must not be negative")
+    record_size = sum(_record_sizes(width, height))
+    records_offset = _HEADER.size + 8 * num_boards
+    partial_path = path + ".partial"
+    with open(partial_path, "wb") as file:
+        file.write(_HEADER.pack(MAGIC, FORMAT_VERSION, _HEADER.size, width, height, num_mines, num_boards, seed,
+                                record_size))
+        file.write((records_offset + np.arange(num_boards, dtype="<u8") * record_size).tobytes())
+        file.truncate(records_offset + num_boards * record_size)
+
+    num_chunks = -(-num_boards // _chunk_boards(width, height))
+    seed_sequences = np.random.SeedSequence(seed).spawn(num_chunks)
+    arguments = [[partial_path] * num_chunks, [records_offset] * num_chunks, [width] * num_chunks,
+                 [height] * num_chunks, [num_mines] * num_chunks, [num_boards] * num_chunks,
+                 range(num_chunks), seed_sequences]
+    if workers <= 1:
+        for chunk_arguments in zip(*arguments):
+            _write_chunk(*chunk_arguments)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for _ in executor.map(_write_chunk, *arguments):
+                pass
+    os.replace(partial_path, path)
+
+
+class CorpusBoard(BitBoard):
+    """A board of a corpus. Its mines and counts are read-only views over the mapped file.
+
+    Nothing is copied when the board is created, and reset keeps the layout.
+    """
+
+    def __init__(self, width: int, height: int, num_mines: int, mines: memoryview, counts: memoryview):
+        """
+        :param width: The horizontal span of the array
+        :param height: The vertical span of the array
+        :param num_mines: The number of mines on the board
+        :param mines: The mine bitset of the record
+        :param counts: The packed adjacent mine counts of the record
+        """
+        self._record_mines = mines
+        self._record_counts = counts
+        super().__init__(width, height, num_mines)
+
+    def _create_random(self) -> None:
+        """Corpus boards never place mines at random."""
+
+        return None
+
+    def _init_game_board(self) -> None:
+        self._clear_cells()
+        self._mines = BitSet(self._total_cells, self._record_mines, count=self._num_mines)
+        self._counts = self._record_counts
+        self._generated = True
+
+    def reset(self) -> None:
+        """Hides every cell and removes every flag. The layout is kept."""
+
+        self._clear_cells()
+        self._game_state.reset_game_state()
+
+
+class Corpus:
+    """Reads a corpus file through a memory map.
+
+    Opening reads only the header. Boards are created as they are asked
+    for and the operating system pages in only the records that are read,
+    so corpora larger than memory can be streamed.
+    """
+
+    def __init__(self, path: str):
+        """
+        :param path: A file written by generate_corpus
+        """
+        with open(path, "rb") as file:
+            header = file.read(_HEADER.size)
+        if len(header) < _HEADER.size:
+            raise ValueError("Not a minesweeper corpus")
+        (magic, version, header_size, self.width, self.height, self.num_mines, self.num_boards, self.seed,
+         record_size) = _HEADER.unpack(header)
+        if magic != MAGIC:
+            raise ValueError("Not a minesweeper corpus")
+        if version > FORMAT_VERSION:
+            raise ValueError("Corpus version {} is newer than this reader".format(version))
+        self._mines_size, _ = _record_sizes(self.width, self.height)
+        self._record_size = record_size
+        self._index = np.memmap(path, dtype="<u8", mode="r", offset=header_size, shape=(self.num_boards,))
+        if os.path.getsize(path) < header_size + 8 * self.num_boards + self.num_boards * record_size:
+            raise ValueError("Corpus file is truncated")
+        self._data = np.memmap(path, dtype=np.uint8, mode="r")
+
+    def close(self) -> None:
+        """Drops the maps. Boards already taken keep their records mapped until they are freed."""
+
+        self._index = None
+        self._data = None
+
+    def __enter__(self) -> "Corpus":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.num_boards
+
+    def _check_open(self) -> None:
+        if self._data is None:
+            raise ValueError("Corpus is closed")
+
+    def _record(self, index: int) -> memoryview:
+        start = int(self._index[index])
+        return memoryview(self._data[start:start + self._record_size])
+
+    def __getitem__(self, index: int) -> CorpusBoard:
+        """Returns board number index. Raises IndexError if there is none."""
+
+        self._check_open()
+        if not -self.num_boards <= index < self.num_boards:
+            raise IndexError("Corpus index out of range")
+        record = self._record(index % self.num_boards)
+        return CorpusBoard(self.width, self.height, self.num_mines, record[:self._mines_size],
+                           record[self._mines_size:])
+
+    def __iter__(self) -> Iterator[CorpusBoard]:
+        for index in range(self.num_boards):
+            yield self[index]
+
+    def mines(self, start: int = 0, stop: int = None) -> np.ndarray:
+        """Returns the layouts of boards start to stop as a boolean array of shape (boards, height, width).
+
+        Raises IndexError unless 0 <= start <= stop. A stop past the end is cut to the number of boards.
+        """
+        self._check_open()
+        stop = self.num_boards if stop is None else min(stop, self.num_boards)
+        if not 0 <= start <= stop:
+            raise IndexError("Corpus range out of range")
+        first = int(self._index[start]) if start < stop else 0
+        records = self._data[first:first + (stop - start) * self._record_size].reshape(-1, self._record_size)
+        bits = np.unpackbits(records[:, :self._mines_size], axis=1, count=self.width * self.height,
+                             bitorder="little")
+        return bits.astype(bool).reshape(-1, self.height, self.width)
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Generate a corpus of minesweeper boards")
+    parser.add_argument("output", help="the corpus file to write")
+    parser.add_argument("--width", type=int, required=True, help="the horizontal span of each board")
+    parser.add_argument("--height", type=int, required=True, help="the vertical span of each board")
+    parser.add_argument("--mines", type=int, required=True, help="the number of mines on each board")
+    parser.add_argument("--boards", type=int, required=True, help="the number of boards to generate")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="the number of worker processes")
+    parser.add_argument("--seed", type=int, default=0, help="master seed, a non-negative integer")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    generate_corpus(args.output, args.width, args.height, args.mines, args.boards, seed=args.seed,
+                    workers=args.workers)
+    seconds = time.perf_counter() - start
+    print("Boards {}, Seconds {:.2f}, Boards per second {:.0f}".format(args.boards, seconds, args.boards / seconds))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
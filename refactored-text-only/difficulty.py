@@ -0,0 +1,30 @@
+from enum import Enum
+
+
+class Difficulty(Enum):
+    """Board presets as (width, height, num_mines)."""
+
+    EASY = (10, 10, 10)
+    MEDIUM = (16, 16, 40)
+    HARD = (25, 20, 99)
+
+    @property
+    def width(self) -> int:
+        return self.value[0]
+
+    @property
+    def height(self) -> int:
+        return self.value[1]
+
+    @property
+    def num_mines(self) -> int:
+        return self.value[2]
+
+    def is_easy(self):
+        return self is Difficulty.EASY
+
+    def is_medium(self):
+        return self is Difficulty.MEDIUM
+
+    def is_hard(self):
+        return self is Difficulty.HARD
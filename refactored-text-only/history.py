@@ -0,0 +1,26 @@
+from typing import NamedTuple, Optional, Tuple
+
+from coordinate import Coordinate
+
+
+class Move(NamedTuple):
+    """What one move changed, linked to the move before it.
+
+    Moves are never modified, so a snapshot is just a reference to the
+    latest move and branches of play share their common moves.
+    """
+
+    revealed: Tuple[Coordinate, ...]
+    flagged: Tuple[Coordinate, ...]
+    unflagged: Tuple[Coordinate, ...]
+    # (finished, win, loss) before and after the move
+    state_before: Tuple[bool, bool, bool]
+    state_after: Tuple[bool, bool, bool]
+    parent: Optional["Move"]
+    depth: int
+
+
+def depth(move: Optional[Move]) -> int:
+    """Returns the number of moves up to and including move. 0 for the start of the game."""
+
+    return 0 if move is None else move.depth
@@ -13,22 +13,6 @@ Implements a basic minesweeper game using the tkinter module.
 Uses a Model-View-Controller structure.
 """
 
-# TODO: implement Difficult Enum into InitializeGame
-# class Difficulty(Enum):
-
-#     EASY = 0
-#     MEDIUM = 1
-#     HARD = 2
-
-#     def is_easy(self):
-#         return self.value == 0
-    
-#     def is_medium(self):
-#         return self.value == 1
-    
-#     def is_hard(self):
-#         return self.value == 2
-
 if __name__ == "__main__":
     TextView(10, 10, 1)
            
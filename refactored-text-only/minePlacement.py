@@ -0,0 +1,50 @@
+from array import array
+from typing import Iterable, List
+
+import numpy as np
+
+
+def skip_excluded(indices: np.ndarray, excluded: Iterable[int]) -> np.ndarray:
+    """Maps indices drawn from range(n - len(excluded)) onto range(n) minus the excluded indices."""
+
+    for index in sorted(excluded):
+        indices[indices >= index] += 1
+    return indices
+
+
+def sample_mine_indices(total_cells: int, num_mines: int, rng, excluded: Iterable[int] = ()) -> List[int]:
+    """Returns num_mines distinct cell indices from range(total_cells) that are not excluded.
+
+    Sparse boards use Floyd's algorithm, which only keeps the chosen indices.
+    Dense boards shuffle the front of a flat index array. Neither builds a
+    coordinate per cell.
+
+    :param total_cells: The number of cells on the board
+    :param num_mines: The number of mines to be seeded
+    :param rng: A random.Random instance or the random module
+    :param excluded: Cell indices that must not hold a mine
+    """
+    excluded = sorted(set(excluded))
+    available = total_cells - len(excluded)
+    if num_mines > available:
+        raise ValueError("More mines than available cells")
+    if num_mines * 16 < available:
+        chosen = set()
+        for upper in range(available - num_mines, available):
+            index = rng.randrange(upper + 1)
+            chosen.add(upper if index in chosen else index)
+        indices = list(chosen)
+    else:
+        pool = array('q' if available >= 1 << 31 else 'i', range(available))
+        for position in range(num_mines):
+            swap = rng.randrange(position, available)
+            pool[position], pool[swap] = pool[swap], pool[position]
+        indices = pool[:num_mines].tolist()
+    if excluded:
+        for position, index in enumerate(indices):
+            for skipped in excluded:
+                if index < skipped:
+                    break
+                index += 1
+            indices[position] = index
+    return indices
@@ -0,0 +1,438 @@
+"""
+Append-only logs of played games and a replayer that seeks through them.
+
+A log starts with a header and is followed by records, each starting with
+a kind byte and a uint64 timestamp in microseconds since the epoch. All
+fields are little-endian:
+
+    header    magic b"MSWL", uint16 version, uint16 header size, uint64 width,
+              uint64 height, uint64 num mines, int64 seed, uint8 has seed
+    LAYOUT    mine bitset of (width * height + 7) // 8 bytes
+    REVEAL    uint32 row, uint32 col
+    FLAG      uint32 row, uint32 col
+    RESET     nothing
+    KEYFRAME  uint64 move number, uint64 offset of the LAYOUT record in effect,
+              uint8 finished, win and loss, revealed bitset, flagged bitset
+
+Bitsets use the layout of saveFile. Every record size follows from its
+kind and the board dimensions, so a reader can hop over records without
+reading their payload. A LAYOUT record is written whenever the mines are
+placed, before the move that placed them, and a KEYFRAME every
+keyframe_interval moves so that seeking only replays the moves after the
+nearest keyframe.
+"""
+
+import os
+import struct
+import time
+from enum import Enum
+from functools import partial
+from typing import BinaryIO, Iterator, List, NamedTuple, Optional, Tuple, Type
+
+from bitset import BitSet, coordinate_bits
+from board import Board
+from controller import Controller
+from coordinate import Coordinate, from_index
+
+
+MAGIC = b"MSWL"
+
+FORMAT_VERSION = 1
+
+# Moves between two keyframes
+KEYFRAME_INTERVAL = 256
+
+_HEADER = struct.Struct("<4sHHQQQqB")
+
+_RECORD = struct.Struct("<BQ")
+
+_CELL = struct.Struct("<II")
+
+_KEYFRAME = struct.Struct("<QQBBB")
+
+_INT64_RANGE = range(-(1 << 63), 1 << 63)
+
+_LAYOUT = 1
+
+_KEYFRAME_KIND = 5
+
+
+class Action(Enum):
+    """The logged Controller calls, valued by their record kind."""
+
+    REVEAL = 2
+    FLAG = 3
+    RESET = 4
+
+
+class LogEntry(NamedTuple):
+    """A replayed move. coord is None for resets."""
+
+    move: int
+    action: Action
+    timestamp: float
+    coord: Optional[Coordinate]
+
+
+def _now() -> int:
+    return time.time_ns() // 1000
+
+
+def _check_board_class(board_class) -> None:
+    """Raises TypeError for Board classes whose layouts cannot be logged and replaced, such as ChunkedBoard."""
+
+    while isinstance(board_class, partial):
+        board_class = board_class.func
+    if isinstance(board_class, type) and not board_class.replaceable_layout:
+        raise TypeError("Move logs cannot record {} layouts".format(board_class.__name__))
+
+
+def _read_log_header(file: BinaryIO) -> Tuple[int, int, int, Optional[int], int]:
+    """Returns width, height, num_mines, seed and the header size. Raises ValueError if it is not a move log."""
+
+    data = file.read(_HEADER.size)
+    if len(data) < _HEADER.size:
+        raise ValueError("Not a minesweeper move log")
+    magic, version, header_size, width, height, num_mines, seed, has_seed = _HEADER.unpack(data)
+    if magic != MAGIC:
+        raise ValueError("Not a minesweeper move log")
+    if version > FORMAT_VERSION:
+        raise ValueError("Move log version {} is newer than this reader".format(version))
+    return width, height, num_mines, seed if has_seed else None, header_size
+
+
+class _RecordReader:
+    """Reads records of a move log one at a time, tracking their file offsets."""
+
+    def __init__(self, path: str):
+        self._file = open(path, "rb")
+        self.width, self.height, self.num_mines, self.seed, self.header_size = _read_log_header(self._file)
+        self._file.seek(self.header_size)
+        self.offset = self.header_size
+        self.bitset_size = (self.width * self.height + 7) // 8
+        self._payload_sizes = {_LAYOUT: self.bitset_size, Action.REVEAL.value: _CELL.size,
+                               Action.FLAG.value: _CELL.size, Action.RESET.value: 0,
+                               _KEYFRAME_KIND: _KEYFRAME.size + 2 * self.bitset_size}
+
+    def seek(self, offset: int) -> None:
+        self._file.seek(offset)
+        self.offset = offset
+
+    def read(self, payload: bool = True) -> Optional[Tuple[int, int, int, bytes]]:
+        """Returns the offset, kind, timestamp and payload of the next record, or None at the end of the log.
+
+        The payload is skipped and returned empty if payload is False, except for keyframe move numbers.
+        A record cut short by a crash while it was written counts as the end of the log.
+        """
+        offset = self.offset
+        data = self._file.read(_RECORD.size)
+        if len(data) < _RECORD.size:
+            self.seek(offset)
+            return None
+        kind, timestamp = _RECORD.unpack(data)
+        size = self._payload_sizes.get(kind)
+        if size is None:
+            raise ValueError("Unknown record kind {} at offset {}".format(kind, offset))
+        end = offset + _RECORD.size + size
+        if payload:
+            body = self._file.read(size)
+            complete = len(body) == size
+        else:
+            body = self._file.read(_KEYFRAME.size) if kind == _KEYFRAME_KIND else b""
+            self._file.seek(end)
+            complete = end <= os.fstat(self._file.fileno()).st_size
+        if not complete:
+            self.seek(offset)
+            return None
+        self.offset = end
+        return offset, kind, timestamp, body
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class MoveLogWriter:
+    """Appends records to a move log, writing its header first if the file is new or empty."""
+
+    def __init__(self, path: str, width: int, height: int, num_mines: int, seed: int = None):
+        """
+        :param path: The log file. An existing log must be of a board of the same dimensions
+        :param width: The horizontal span of the array
+        :param height: The vertical span of the array
+        :param num_mines: The number of mines to be seeded
+        :param seed: The board seed, stored for reference if it is a 64-bit integer
+        """
+        self.num_moves = 0
+        self.layout_offset = None
+        self.appended = False
+        if os.path.exists(path) and os.path.getsize(path):
+            self._resume(path, width, height, num_mines)
+        self._file = open(path, "ab")
+        if not self.appended:
+            has_seed = isinstance(seed, int) and seed in _INT64_RANGE
+            self._file.write(_HEADER.pack(MAGIC, FORMAT_VERSION, _HEADER.size, width, height, num_mines,
+                                          seed if has_seed else 0, has_seed))
+        self._offset = self._file.tell()
+
+    def _resume(self, path: str, width: int, height: int, num_mines: int) -> None:
+        """Counts the moves of an existing log and cuts off a record left incomplete by a crash."""
+
+        reader = _RecordReader(path)
+        try:
+            if (reader.width, reader.height, reader.num_mines) != (width, height, num_mines):
+                raise ValueError("The move log is of a {}x{} board with {} mines".format(
+                    reader.width, reader.height, reader.num_mines))
+            while True:
+                record = reader.read(payload=False)
+                if record is None:
+                    break
+                if record[1] != _LAYOUT and record[1] != _KEYFRAME_KIND:
+                    self.num_moves += 1
+            end = reader.offset
+        finally:
+            reader.close()
+        os.truncate(path, end)
+        self.appended = True
+
+    def _write(self, kind: int, *parts) -> int:
+        """Writes one record and flushes it. Returns its offset."""
+
+        offset = self._offset
+        data = _RECORD.pack(kind, _now()) + b"".join(parts)
+        self._file.write(data)
+        self._file.flush()
+        self._offset += len(data)
+        return offset
+
+    def layout(self, board: Board) -> None:
+        self.layout_offset = self._write(_LAYOUT, bytes(board.mine_bitset().buffer))
+
+    def move(self, action: Action, coord: Coordinate = None) -> None:
+        self._write(action.value, b"" if coord is None else _CELL.pack(coord.row, coord.col))
+        self.num_moves += 1
+
+    def keyframe(self, board: Board) -> None:
+        """Records the revealed and flagged cells and the game state after the moves so far."""
+
+        game_state = board.get_game_state()
+        self._write(_KEYFRAME_KIND,
+                    _KEYFRAME.pack(self.num_moves, self.layout_offset, game_state.finished, game_state.win,
+                                   game_state.loss),
+                    bytes(coordinate_bits(board.cells_revealed(), board.width, board.height).buffer),
+                    bytes(coordinate_bits(board.cells_flagged(), board.width, board.height).buffer))
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class LoggedController(Controller):
+    """A Controller appending every reveal_decision, update_flagged_cell and reset call to a move log.
+
+    Moves are flushed as they are made, so the log of a crashed session can
+    still be replayed. Logging to an existing log of the same board size
+    starts a new game in it, as if reset had been called.
+    """
+
+    def __init__(self, width: int, height: int, num_mines: int, log_path: str, board_class: Type[Board] = Board,
+                 seed: int = None, keyframe_interval: int = KEYFRAME_INTERVAL):
+        """
+        :param width: The horizontal span of the array
+        :param height: The vertical span of the array
+        :param num_mines: The number of mines to be seeded
+        :param log_path: The move log to append to
+        :param board_class: The Board implementation holding the game grid. Raises TypeError for ChunkedBoard
+        :param seed: Seed for reproducible boards. The board class decides its default if None
+        :param keyframe_interval: Moves between two keyframes
+        """
+        _check_board_class(board_class)
+        super().__init__(width, height, num_mines, board_class=board_class, seed=seed)
+        _check_board_class(type(self.board))
+        self._log = MoveLogWriter(log_path, width, height, num_mines, seed=self.board.seed)
+        self._keyframe_interval = keyframe_interval
+        if self._log.appended:
+            self._logged(Action.RESET)
+        if self.board.generated:
+            self._log.layout(self.board)
+
+    @property
+    def log(self) -> MoveLogWriter:
+        return self._log
+
+    def _logged(self, action: Action, coord: Coordinate = None) -> None:
+        self._log.move(action, coord)
+        if self._log.num_moves % self._keyframe_interval == 0 and self._log.layout_offset is not None:
+            self._log.keyframe(self.board)
+
+    def reset(self) -> None:
+        super().reset()
+        self._log.layout_offset = None
+        self._logged(Action.RESET)
+        if self.board.generated:
+            self._log.layout(self.board)
+
+    def reveal_decision(self, index: Coordinate):
+        if not self.board.generated:
+            self.board.generate(index)
+            self._log.layout(self.board)
+        result = super().reveal_decision(index)
+        self._logged(Action.REVEAL, index)
+        return result
+
+    def update_flagged_cell(self, index: Coordinate) -> int:
+        result = super().update_flagged_cell(index)
+        self._logged(Action.FLAG, index)
+        return result
+
+    def close(self) -> None:
+        self._log.close()
+
+
+class Replayer:
+    """Plays a move log back on a Controller.
+
+    Records are read as they are needed, so logs of any length replay in
+    constant memory apart from the keyframe index. seek() jumps to any move
+    by loading the nearest keyframe at or before it and replaying the rest.
+    """
+
+    def __init__(self, path: str, board_class: Type[Board] = Board):
+        """
+        :param path: The move log to play back
+        :param board_class: The Board implementation of the replayed game. Its layouts are taken from the log.
+                            Raises TypeError for ChunkedBoard
+        """
+        _check_board_class(board_class)
+        self._reader = _RecordReader(path)
+        self.width, self.height = self._reader.width, self._reader.height
+        self.num_mines, self.seed = self._reader.num_mines, self._reader.seed
+        self.controller = Controller(self.width, self.height, self.num_mines,
+                                     board_class=partial(board_class, safe_first_click=True))
+        self._position = 0
+        # (move number, offset) of the keyframes read so far, in log order
+        self._keyframes = []
+        self._scanned = self._reader.header_size
+
+    @property
+    def position(self) -> int:
+        """The number of moves replayed so far."""
+
+        return self._position
+
+    def _note_keyframe(self, offset: int, body: bytes) -> None:
+        """Indexes a keyframe just read, unless it is already known."""
+
+        if offset >= self._scanned:
+            self._keyframes.append((_KEYFRAME.unpack_from(body)[0], offset))
+            self._scanned = self._reader.offset
+
+    def _load_layout(self, body: bytes) -> None:
+        self.controller.board.place_mines(BitSet(self.width * self.height, bytearray(body)))
+
+    def step(self) -> Optional[LogEntry]:
+        """Replays the next move. Returns it, or None at the end of the log."""
+
+        while True:
+            record = self._reader.read()
+            if record is None:
+                return None
+            offset, kind, timestamp, body = record
+            if kind == _LAYOUT:
+                self._load_layout(body)
+                continue
+            if kind == _KEYFRAME_KIND:
+                self._note_keyframe(offset, body)
+                continue
+            action = Action(kind)
+            coord = None
+            if action is Action.RESET:
+                self.controller.reset()
+            else:
+                coord = Coordinate(*_CELL.unpack(body))
+                if action is Action.REVEAL:
+                    self.controller.reveal_decision(coord)
+                else:
+                    self.controller.update_flagged_cell(coord)
+            self._position += 1
+            return LogEntry(self._position, action, timestamp / 1e6, coord)
+
+    def __iter__(self) -> Iterator[LogEntry]:
+        """Replays the remaining moves, yielding each one."""
+
+        while True:
+            entry = self.step()
+            if entry is None:
+                return
+            yield entry
+
+    def _index_keyframes(self, position: int) -> None:
+        """Reads record headers ahead until a keyframe past position or the end of the log."""
+
+        if self._keyframes and self._keyframes[-1][0] > position:
+            return
+        resume = self._reader.offset
+        self._reader.seek(self._scanned)
+        while True:
+            record = self._reader.read(payload=False)
+            if record is None:
+                break
+            offset, kind, _, body = record
+            if kind == _KEYFRAME_KIND:
+                self._note_keyframe(offset, body)
+                if self._keyframes[-1][0] > position:
+                    break
+            self._scanned = self._reader.offset
+        self._reader.seek(resume)
+
+    def _load_keyframe(self, offset: int) -> None:
+        self._reader.seek(offset)
+        _, _, _, body = self._reader.read()
+        move, layout_offset, finished, win, loss = _KEYFRAME.unpack_from(body)
+        revealed_start = _KEYFRAME.size
+        flagged_start = revealed_start + self._reader.bitset_size
+        resume = self._reader.offset
+        self.controller.reset()
+        self._reader.seek(layout_offset)
+        self._load_layout(self._reader.read()[3])
+        board = self.controller.board
+        size = self.width * self.height
+        for index in BitSet(size, bytearray(body[revealed_start:flagged_start])):
+            board.add_to_revealed_cells(from_index(index, self.width))
+        for index in BitSet(size, bytearray(body[flagged_start:])):
+            board.add_to_cells_flagged(from_index(index, self.width))
+        board.get_game_state().set_game_state(bool(finished), bool(win), bool(loss))
+        self._reader.seek(resume)
+        self._position = move
+
+    def _rewind(self) -> None:
+        self.controller.reset()
+        self._reader.seek(self._reader.header_size)
+        self._position = 0
+
+    def seek(self, position: int) -> int:
+        """Moves to the state after the given number of moves. Returns the position reached, which is
+        the last move if the log is shorter.
+        """
+        if position < 0:
+            raise ValueError("Negative move number")
+        self._index_keyframes(position)
+        nearest = None
+        for move, offset in self._keyframes:
+            if move > position:
+                break
+            nearest = move, offset
+        if position < self._position or (nearest is not None and nearest[0] > self._position):
+            if nearest is None:
+                self._rewind()
+            else:
+                self._load_keyframe(nearest[1])
+        while self._position < position and self.step() is not None:
+            pass
+        return self._position
+
+    def keyframes(self) -> List[int]:
+        """The move numbers of the keyframes indexed so far."""
+
+        return [move for move, _ in self._keyframes]
+
+    def close(self) -> None:
+        self._reader.close()
@@ -0,0 +1,59 @@
+from functools import lru_cache
+from typing import Tuple
+
+
+class NeighborTable:
+    """The in-bounds neighbors of every cell of a board shape.
+
+    A cell's neighbors only depend on whether it has a row above and below
+    it and a column left and right of it. The neighbor offsets of each of
+    these 16 cases are computed once and shared, so a lookup returns an
+    existing tuple and needs no bounds checks. Nothing is stored per cell,
+    which keeps tables cheap for boards of any size.
+    """
+
+    __slots__ = ("width", "height", "_last_row", "_last_col", "_offsets", "_steps")
+
+    def __init__(self, width: int, height: int):
+        """
+        :param width: The horizontal span of the array
+        :param height: The vertical span of the array
+        """
+        self.width = width
+        self.height = height
+        self._last_row = height - 1
+        self._last_col = width - 1
+        # Indexed by _case: bits 0 and 1 are set for a row above and below, bits 2 and 3 for a column left and right
+        self._steps = []
+        for case in range(16):
+            row_steps = [0] + [-1] * (case & 1) + [1] * (case >> 1 & 1)
+            col_steps = [0] + [-1] * (case >> 2 & 1) + [1] * (case >> 3 & 1)
+            self._steps.append(tuple(sorted((row_step, col_step) for row_step in row_steps for col_step in col_steps
+                                            if row_step or col_step)))
+        self._offsets = [tuple(row_step * width + col_step for row_step, col_step in steps) for steps in self._steps]
+
+    def _case(self, row: int, col: int) -> int:
+        return (row > 0) | (row < self._last_row) << 1 | (col > 0) << 2 | (col < self._last_col) << 3
+
+    def offsets(self, row: int, col: int) -> Tuple[int, ...]:
+        """Returns what to add to the row-major index of a cell to get each of its neighbors."""
+
+        return self._offsets[self._case(row, col)]
+
+    def steps(self, row: int, col: int) -> Tuple[Tuple[int, int], ...]:
+        """Returns the (row, col) steps from a cell to each of its neighbors."""
+
+        return self._steps[self._case(row, col)]
+
+    def neighbors(self, index: int) -> Tuple[int, ...]:
+        """Returns the row-major indices of the neighbors of a cell index."""
+
+        row, col = divmod(index, self.width)
+        return tuple(index + offset for offset in self._offsets[self._case(row, col)])
+
+
+@lru_cache(maxsize=8)
+def neighbor_table(width: int, height: int) -> NeighborTable:
+    """Returns the NeighborTable of a board shape, shared while the shape is in recent use."""
+
+    return NeighborTable(width, height)
@@ -0,0 +1,279 @@
+"""
+Boards that can be solved from their first click without guessing.
+
+A candidate layout keeps the first click's 3x3 area free and is played by
+the Solver, falling back to exact mine probabilities whenever the Solver's
+local rules are stuck. Cells with probability 0 or 1 are certain, so the
+board is solvable if those moves alone win. When they do not, a mine from
+the stuck frontier is moved to a cell that no revealed number touches and
+the candidate is played again. Candidates that still get stuck after
+max_repairs moves are dropped for a new one.
+"""
+
+import logging
+import threading
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import partial
+from random import Random
+from typing import AbstractSet, Iterable, List, NamedTuple, Optional, Tuple
+
+from board import Board
+from controller import Controller
+from coordinate import Coordinate
+from difficulty import Difficulty
+from minePlacement import sample_mine_indices
+from neighbors import neighbor_table
+from probability import mine_probabilities
+from solver import Solver
+
+
+# Mine moves tried on one candidate before drawing another
+MAX_REPAIRS = 100
+
+_logger = logging.getLogger(__name__)
+
+
+class NoGuessLayout(NamedTuple):
+    """A layout solvable without guessing when start is revealed first."""
+
+    mines: Tuple[int, ...]
+    start: Coordinate
+
+
+def play_without_guessing(width: int, height: int, num_mines: int, mines: AbstractSet[int],
+                          start: Coordinate) -> Board:
+    """Reveals start and then only certain cells, until the game is won or no cell is certain.
+
+    Returns the board, which is won if the layout needs no guess.
+    """
+    board = Board(width, height, num_mines, safe_first_click=True)
+    board.place_mines(mines)
+    controller = Controller.from_board(board)
+    solver = Solver(width, height)
+    solver.observe(controller.reveal_decision(start))
+    while not board.get_game_state().finished:
+        solver.play(controller)
+        if board.get_game_state().finished:
+            break
+        certain = [(cell, probability) for cell, probability in mine_probabilities(board).items()
+                   if probability in (0.0, 1.0)]
+        if not certain:
+            break
+        for cell, probability in certain:
+            if probability == 1.0:
+                controller.update_flagged_cell(cell)
+            else:
+                solver.observe(controller.reveal_decision(cell))
+    return board
+
+
+def _stuck_cells(board: Board) -> Tuple[List[int], List[int]]:
+    """Returns the hidden cell indices next to revealed cells and those no revealed cell touches."""
+
+    width = board.width
+    revealed = board.cells_revealed()
+    frontier, far = [], []
+    for index in range(board.width * board.height):
+        row, col = divmod(index, width)
+        if Coordinate(row, col) in revealed:
+            continue
+        if any(Coordinate(row + row_step, col + col_step) in revealed
+               for row_step, col_step in board.neighbors.steps(row, col)):
+            frontier.append(index)
+        else:
+            far.append(index)
+    return frontier, far
+
+
+def generate_no_guess(width: int, height: int, num_mines: int, seed: int = None, start: Coordinate = None,
+                      max_repairs: int = MAX_REPAIRS) -> NoGuessLayout:
+    """Returns a layout solvable from start without guessing. start is picked at random if None.
+
+    Raises ValueError if the mines do not leave the 3x3 area of start free.
+    """
+    rng = Random(seed)
+    if start is None:
+        start = Coordinate(rng.randrange(height), rng.randrange(width))
+    clicked = start.row * width + start.col
+    area = {clicked} | {clicked + offset for offset in neighbor_table(width, height).offsets(*start)}
+    if num_mines > width * height - len(area):
+        raise ValueError("Too many mines to keep the first click's area free")
+    while True:
+        mines = set(sample_mine_indices(width * height, num_mines, rng, area))
+        for _ in range(max_repairs + 1):
+            board = play_without_guessing(width, height, num_mines, mines, start)
+            if board.get_game_state().win:
+                return NoGuessLayout(tuple(sorted(mines)), start)
+            frontier, far = _stuck_cells(board)
+            frontier_mines = [index for index in frontier if index in mines]
+            far_cells = [index for index in far if index not in mines and index not in area]
+            if not frontier_mines or not far_cells:
+                break
+            mines.remove(rng.choice(frontier_mines))
+            mines.add(rng.choice(far_cells))
+
+
+class NoGuessPool:
+    """Ready no-guess layouts for each Difficulty, refilled in the background.
+
+    Layouts are generated by a process pool as soon as the pool is created
+    and again whenever one is taken, so taking one does not wait as long as
+    boards are not started faster than they are generated.
+    """
+
+    def __init__(self, size: int = 4, workers: Optional[int] = None, seed: int = None,
+                 difficulties: Iterable[Difficulty] = tuple(Difficulty)):
+        """
+        :param size: The number of layouts kept ready per difficulty
+        :param workers: The number of worker processes. None uses every core and 0 generates in this process,
+                        where a failed generation raises instead of being logged
+        :param seed: Seed for the generation seeds. Layouts arrive in completion order, so only workers=0 is
+                     reproducible
+        :param difficulties: The presets to keep layouts for
+        """
+        self._size = size
+        self._rng = Random(seed)
+        self._executor = None if workers == 0 else ProcessPoolExecutor(max_workers=workers)
+        self._lock = threading.Lock()
+        self._closed = False
+        self._ready = {difficulty: deque() for difficulty in difficulties}
+        self._pending = {difficulty: 0 for difficulty in difficulties}
+        for difficulty in self._ready:
+            self._refill(difficulty)
+
+    def _refill(self, difficulty: Difficulty) -> None:
+        while True:
+            with self._lock:
+                if self._closed or len(self._ready[difficulty]) + self._pending[difficulty] >= self._size:
+                    return
+                self._pending[difficulty] += 1
+                seed = self._rng.getrandbits(63)
+            if self._executor is None:
+                future = Future()
+                try:
+                    future.set_result(generate_no_guess(*difficulty.value, seed=seed))
+                except Exception:
+                    with self._lock:
+                        self._pending[difficulty] -= 1
+                    raise
+                self._done(difficulty, future, refill=False)
+            else:
+                try:
+                    future = self._executor.submit(generate_no_guess, *difficulty.value, seed=seed)
+                except RuntimeError:
+                    # Closed since the check above
+                    with self._lock:
+                        self._pending[difficulty] -= 1
+                    return
+                future.add_done_callback(partial(self._done, difficulty))
+
+    def _done(self, difficulty: Difficulty, future: Future, refill: bool = True) -> None:
+        """Keeps a finished layout. A failed generation is logged and started again."""
+
+        if future.cancelled():
+            with self._lock:
+                self._pending[difficulty] -= 1
+            return
+        error = future.exception()
+        with self._lock:
+            self._pending[difficulty] -= 1
+            if error is None:
+                self._ready[difficulty].append(future.result())
+        if error is not None:
+            _logger.error("Generating a %s layout failed", difficulty.name, exc_info=error)
+        if refill:
+            self._refill(difficulty)
+
+    def ready(self, difficulty: Difficulty) -> int:
+        """The number of layouts that can be taken without waiting."""
+
+        return len(self._ready[difficulty])
+
+    def take(self, difficulty: Difficulty) -> Optional[NoGuessLayout]:
+        """Returns a ready layout and starts generating its replacement, or None if none is ready.
+
+        Raises KeyError for a difficulty the pool does not keep.
+        """
+        with self._lock:
+            ready = self._ready[difficulty]
+            layout = ready.popleft() if ready else None
+        self._refill(difficulty)
+        return layout
+
+    def close(self) -> None:
+        """Stops generating. Layouts already generated can still be taken."""
+
+        with self._lock:
+            self._closed = True
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+
+    def __enter__(self) -> "NoGuessPool":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def _difficulty_of(width: int, height: int, num_mines: int) -> Optional[Difficulty]:
+    for difficulty in Difficulty:
+        if difficulty.value == (width, height, num_mines):
+            return difficulty
+    return None
+
+
+class NoGuessBoard(Board):
+    """A board that never needs a guess when start_cell is revealed first.
+
+    Layouts come from the pool when the board has a preset's dimensions and
+    a layout is ready, and are generated here otherwise. With
+    safe_first_click the layout is instead generated for the actual first
+    click, which waits for the generator.
+    """
+
+    def __init__(self, width: int, height: int, num_mines: int, pool: NoGuessPool = None,
+                 safe_first_click: bool = False, seed: int = None):
+        """
+        :param width: The horizontal span of the array
+        :param height: The vertical span of the array
+        :param num_mines: The number of mines to be seeded
+        :param pool: Ready layouts to take from
+        :param safe_first_click: Wait for the first revealed cell and generate a layout solvable from it
+        :param seed: Seed of the board's own random generator, used when a layout is generated here
+        """
+        self._pool = pool
+        self._difficulty = _difficulty_of(width, height, num_mines)
+        self._start = None
+        super().__init__(width, height, num_mines, safe_first_click=safe_first_click, seed=seed)
+
+    @property
+    def start_cell(self) -> Optional[Coordinate]:
+        """The cell to reveal first, or None until the mines are placed."""
+
+        return self._start
+
+    def _use_layout(self, layout: NoGuessLayout) -> None:
+        self.place_mines(layout.mines)
+        self._start = layout.start
+
+    def _clear_cells(self) -> None:
+        super()._clear_cells()
+        self._start = None
+
+    def _generate_layout(self, excluded: AbstractSet[int] = frozenset()) -> None:
+        """Takes a ready layout from the pool, or generates one from a random start cell."""
+
+        layout = None
+        if self._pool is not None and self._difficulty is not None:
+            layout = self._pool.take(self._difficulty)
+        if layout is None:
+            layout = generate_no_guess(self._width, self._height, self._num_mines,
+                                       seed=self._random.getrandbits(63))
+        self._use_layout(layout)
+
+    def generate(self, first_click: Coordinate) -> None:
+        """Places mines so that the board is solvable without guessing from the first revealed cell."""
+
+        self._use_layout(generate_no_guess(self._width, self._height, self._num_mines,
+                                           seed=self._random.getrandbits(63), start=first_click))
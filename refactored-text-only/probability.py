@@ -0,0 +1,212 @@
+from math import comb
+from typing import Dict, List, Set, Tuple
+
+from board import Board
+from coordinate import Coordinate
+
+
+def _add(total: List[int], poly: List[int], shift: int = 0) -> None:
+    """Adds poly multiplied by x ** shift into total, growing total as needed."""
+
+    if len(total) < len(poly) + shift:
+        total.extend([0] * (len(poly) + shift - len(total)))
+    for power, value in enumerate(poly):
+        total[power + shift] += value
+
+
+def _multiply(first: List[int], second: List[int]) -> List[int]:
+    result = [0] * (len(first) + len(second) - 1)
+    for first_power, first_value in enumerate(first):
+        if first_value:
+            for second_power, second_value in enumerate(second):
+                result[first_power + second_power] += first_value * second_value
+    return result
+
+
+class Component:
+    """Frontier cells linked by shared constraints, solved independently of the rest.
+
+    Configurations are counted by the number of mines they use. A forward
+    pass counts the ways to assign the first cells for every reachable vector
+    of remaining constraint needs, and a backward pass counts the ways to
+    finish from it. Equal need vectors are merged, which is what keeps the
+    count from growing exponentially.
+    """
+
+    def __init__(self, cells: List[Coordinate], constraints: List[Tuple[Set[Coordinate], int]]):
+        """
+        :param cells: The hidden cells of the component
+        :param constraints: (hidden cells, mines among them) pairs covering the component
+        """
+        self.cells = cells
+        position = {cell: index for index, cell in enumerate(cells)}
+        self._needs = tuple(needed for _, needed in constraints)
+        self._touching = [[] for _ in cells]
+        # remaining[j][i] is the number of cells of constraint j after cell i
+        self._remaining = []
+        for index, (constraint_cells, _) in enumerate(constraints):
+            positions = sorted(position[cell] for cell in constraint_cells)
+            for cell_position in positions:
+                self._touching[cell_position].append(index)
+            remaining = [0] * len(cells)
+            for count, cell_position in enumerate(positions):
+                remaining[cell_position] = len(positions) - count - 1
+            self._remaining.append(remaining)
+        self.counts = []
+        self.cell_counts = []
+        self._solve()
+
+    def _assign(self, index: int, needs: Tuple[int, ...], is_mine: int):
+        """Returns the needs after cell index gets is_mine, or None if a constraint breaks."""
+
+        needs = list(needs)
+        for constraint in self._touching[index]:
+            needed = needs[constraint] - is_mine
+            if needed < 0 or needed > self._remaining[constraint][index]:
+                return None
+            needs[constraint] = needed
+        return tuple(needs)
+
+    def _solve(self) -> None:
+        num_cells = len(self.cells)
+        forward = [{self._needs: [1]}]
+        for index in range(num_cells):
+            layer = {}
+            for needs, poly in forward[index].items():
+                for is_mine in (0, 1):
+                    after = self._assign(index, needs, is_mine)
+                    if after is not None:
+                        _add(layer.setdefault(after, []), poly, is_mine)
+            forward.append(layer)
+
+        backward = {(0,) * len(self._needs): [1]}
+        cell_counts = [None] * num_cells
+        for index in range(num_cells - 1, -1, -1):
+            layer = {}
+            mine_poly = []
+            for needs, poly in forward[index].items():
+                for is_mine in (0, 1):
+                    after = self._assign(index, needs, is_mine)
+                    if after is None or after not in backward:
+                        continue
+                    _add(layer.setdefault(needs, []), backward[after], is_mine)
+                    if is_mine:
+                        _add(mine_poly, _multiply(poly, backward[after]), 1)
+            cell_counts[index] = mine_poly
+            backward = layer
+        self.counts = backward.get(self._needs, [0])
+        self.cell_counts = cell_counts
+
+
+def _components(board: Board) -> Tuple[List[Component], List[Coordinate]]:
+    """Splits the hidden cells into frontier components and the interior cells."""
+
+    revealed, flagged = board.cells_revealed(), board.cells_flagged()
+    constraints = []
+    frontier = set()
+    steps = board.neighbors.steps
+    for coord in revealed:
+        value = board.get_cell_value(coord)
+        if value.isMine():
+            continue
+        hidden = set()
+        needed = value.value
+        for row_step, col_step in steps(coord.row, coord.col):
+            adjacent = Coordinate(coord.row + row_step, coord.col + col_step)
+            if adjacent in revealed:
+                continue
+            if adjacent in flagged:
+                needed -= 1
+            else:
+                hidden.add(adjacent)
+        if hidden:
+            constraints.append((hidden, needed))
+            frontier |= hidden
+
+    # Union-find over cells, joining the cells of each constraint
+    parent = {cell: cell for cell in frontier}
+
+    def find(cell):
+        while parent[cell] != cell:
+            parent[cell] = parent[parent[cell]]
+            cell = parent[cell]
+        return cell
+
+    for hidden, _ in constraints:
+        first, *rest = hidden
+        for cell in rest:
+            parent[find(cell)] = find(first)
+
+    grouped = {}
+    for hidden, needed in constraints:
+        grouped.setdefault(find(next(iter(hidden))), []).append((hidden, needed))
+    components = []
+    for group in grouped.values():
+        cells = _order_cells(group)
+        components.append(Component(cells, group))
+
+    interior = [Coordinate(row, col) for row in range(board.height) for col in range(board.width)
+                if Coordinate(row, col) not in revealed and Coordinate(row, col) not in flagged
+                and Coordinate(row, col) not in frontier]
+    return components, interior
+
+
+def _order_cells(constraints: List[Tuple[Set[Coordinate], int]]) -> List[Coordinate]:
+    """Orders cells so that each constraint's cells sit close together, keeping the open constraints few."""
+
+    cells = []
+    seen = set()
+    remaining = sorted(constraints, key=lambda constraint: min(constraint[0]))
+    while remaining:
+        # Next take the constraint sharing the most cells with those already placed
+        best = max(range(len(remaining)), key=lambda index: len(remaining[index][0] & seen))
+        hidden, _ = remaining.pop(best)
+        for cell in sorted(hidden - seen):
+            cells.append(cell)
+            seen.add(cell)
+    return cells
+
+
+def mine_probabilities(board: Board) -> Dict[Coordinate, float]:
+    """Returns the exact chance that each hidden, unflagged cell holds a mine.
+
+    Every layout consistent with the revealed numbers and with board.mines_left
+    mines among the hidden cells is taken as equally likely. Flagged cells
+    are assumed to be mines.
+    """
+
+    components, interior = _components(board)
+    mines_left = board.mines_left
+    num_interior = len(interior)
+
+    # prefix[i] and suffix[i] count the mines used by the components before and after component i
+    prefix = [[1]]
+    for component in components:
+        prefix.append(_multiply(prefix[-1], component.counts))
+    suffix = [[1]]
+    for component in reversed(components):
+        suffix.append(_multiply(suffix[-1], component.counts))
+    suffix.reverse()
+
+    def interior_ways(mines: int) -> int:
+        return comb(num_interior, mines) if 0 <= mines <= num_interior else 0
+
+    all_counts = prefix[-1]
+    total = sum(ways * interior_ways(mines_left - mines) for mines, ways in enumerate(all_counts))
+    if total == 0:
+        raise ValueError("No mine layout agrees with the revealed cells")
+
+    probabilities = {}
+    for index, component in enumerate(components):
+        rest = _multiply(prefix[index], suffix[index + 1])
+        factor = [sum(ways * interior_ways(mines_left - mines - rest_mines) for rest_mines, ways in enumerate(rest))
+                  for mines in range(len(component.counts) + 1)]
+        for cell, poly in zip(component.cells, component.cell_counts):
+            probabilities[cell] = sum(ways * factor[mines] for mines, ways in enumerate(poly)) / total
+
+    if num_interior:
+        interior_mines = sum(ways * comb(num_interior - 1, mines_left - mines - 1)
+                             for mines, ways in enumerate(all_counts) if mines_left - mines >= 1)
+        for cell in interior:
+            probabilities[cell] = interior_mines / total
+    return probabilities
@@ -0,0 +1,129 @@
+"""
+Opt-in timing of the Board and Controller hot paths.
+
+enable() swaps the instrumented methods for timing wrappers and disable()
+puts the originals back, so nothing is measured and nothing is slowed down
+unless profiling is switched on. Counters survive disable() until reset().
+"""
+
+import functools
+import time
+from typing import Dict, Iterable, List, Type
+
+from board import Board
+from controller import Controller
+
+
+BOARD_METHODS = [
+    "reset", "_add_mines", "_set_adjacent_mine_count", "_index_zero_regions", "generate",
+    "get_cell_value", "is_valid_cell", "add_to_revealed_cells", "add_to_cells_flagged",
+    "remove_from_cells_flagged",
+]
+
+CONTROLLER_METHODS = [
+    "reset", "reveal_decision", "reveal_cell", "reveal_zeroes", "reveal_zeroes_bfs",
+    "update_flagged_cell", "update_game_state", "reveal_all_cells", "undo", "redo", "restore",
+]
+
+
+class CallStats:
+    """Call count, cumulative and longest wall time of one method."""
+
+    __slots__ = ("calls", "total", "max")
+
+    def __init__(self):
+        self.calls = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def clear(self) -> None:
+        self.calls = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def __str__(self):
+        return "(" + "Calls " + str(self.calls) + ", " + "Total " + str(self.total) + ", " + "Max " + str(self.max) + ")"
+
+
+_stats = {}
+_originals = {}
+
+
+def _default_targets() -> Dict[Type, List[str]]:
+    """Board, every Board subclass imported so far and Controller."""
+
+    targets = {Controller: CONTROLLER_METHODS}
+    pending = [Board]
+    while pending:
+        cls = pending.pop()
+        targets[cls] = BOARD_METHODS
+        pending.extend(cls.__subclasses__())
+    return targets
+
+
+def _timed(stats: CallStats, function):
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            stats.calls += 1
+            stats.total += elapsed
+            if elapsed > stats.max:
+                stats.max = elapsed
+    return wrapper
+
+
+def enable(targets: Dict[Type, Iterable[str]] = None) -> None:
+    """Starts timing the given methods of each class. Defaults to the Board and Controller hot paths.
+
+    Only methods a class defines itself are wrapped, so overrides in subclasses are timed separately.
+    """
+    if targets is None:
+        targets = _default_targets()
+    for cls, names in targets.items():
+        for name in names:
+            if name not in cls.__dict__ or (cls, name) in _originals:
+                continue
+            original = cls.__dict__[name]
+            stats = _stats.setdefault(cls.__name__ + "." + name, CallStats())
+            _originals[(cls, name)] = original
+            setattr(cls, name, _timed(stats, original))
+
+
+def disable() -> None:
+    """Restores every instrumented method."""
+
+    for (cls, name), original in _originals.items():
+        setattr(cls, name, original)
+    _originals.clear()
+
+
+def is_enabled() -> bool:
+    return bool(_originals)
+
+
+def reset() -> None:
+    """Zeroes every counter."""
+
+    for stats in _stats.values():
+        stats.clear()
+
+
+def stats() -> Dict[str, CallStats]:
+    """Returns the counters keyed by "Class.method"."""
+
+    return dict(_stats)
+
+
+def report() -> str:
+    """Returns a table of the methods called so far, slowest in total first."""
+
+    lines = ["{:<40} {:>10} {:>12} {:>12}".format("Method", "Calls", "Total ms", "Max ms")]
+    for name, entry in sorted(_stats.items(), key=lambda item: -item[1].total):
+        if entry.calls:
+            lines.append("{:<40} {:>10} {:>12.3f} {:>12.3f}".format(
+                name, entry.calls, entry.total * 1000, entry.max * 1000))
+    return "\n".join(lines)
@@ -0,0 +1,225 @@
+"""
+Binary save files for boards.
+
+A file starts with a fixed header, followed by three bitsets of
+(width * height + 7) // 8 bytes each: mines, revealed cells and flagged
+cells. Bit i of a bitset is cell index i in row-major order, stored in
+byte i // 8 at position i % 8. All header fields are little-endian:
+
+    magic         4 bytes  b"MSWP"
+    version       uint16   FORMAT_VERSION
+    header size   uint16   offset of the first bitset
+    width         uint64
+    height        uint64
+    num mines     uint64
+    seed          int64    only meaningful if has seed is 1
+    has seed      uint8
+    finished      uint8
+    win           uint8
+    loss          uint8
+    wins          uint32
+    losses        uint32
+    num revealed  uint64
+    num flagged   uint64
+
+Readers skip to the header size, so later versions may append fields.
+"""
+
+import mmap
+import os
+import struct
+from typing import Dict, Iterable, Union
+
+from bitset import BitSet, CoordinateBitSet, coordinate_bits
+from board import Board
+from cellEntry import Entry, EntryValue
+from coordinate import Coordinate
+
+
+MAGIC = b"MSWP"
+
+FORMAT_VERSION = 1
+
+_HEADER = struct.Struct("<4sHHQQQqBBBBIIQQ")
+
+_INT64_RANGE = range(-(1 << 63), 1 << 63)
+
+
+def save_board(board: Board, path: str) -> None:
+    """Writes a board, its revealed and flagged cells and its game state to a save file.
+
+    The file is written next to path and then moved over it, so boards mapped from
+    an earlier save stay valid. Seeds that are not 64-bit integers are not stored.
+    Raises ValueError if the mines are not placed yet.
+    """
+    if not board.generated:
+        raise ValueError("The board has no mine layout yet")
+    seed = board.seed
+    has_seed = isinstance(seed, int) and seed in _INT64_RANGE
+    game_state = board.get_game_state()
+    header = _HEADER.pack(MAGIC, FORMAT_VERSION, _HEADER.size, board.width, board.height, board.num_mines,
+                          seed if has_seed else 0, has_seed, game_state.finished, game_state.win, game_state.loss,
+                          board.wins, board.losses, board.num_revealed, board.num_flagged)
+    partial_path = path + ".partial"
+    with open(partial_path, "wb") as file:
+        file.write(header)
+        for bits in (board.mine_bitset(), coordinate_bits(board.cells_revealed(), board.width, board.height),
+                     coordinate_bits(board.cells_flagged(), board.width, board.height)):
+            file.write(bits.buffer)
+    os.replace(partial_path, path)
+
+
+def read_header(buffer) -> Dict[str, Union[int, bool, None]]:
+    """Returns the header fields of a save file. Raises ValueError if it is not a save file this version reads."""
+
+    if len(buffer) < _HEADER.size:
+        raise ValueError("Not a minesweeper save file")
+    (magic, version, header_size, width, height, num_mines, seed, has_seed, finished, win, loss,
+     wins, losses, num_revealed, num_flagged) = _HEADER.unpack_from(buffer)
+    if magic != MAGIC:
+        raise ValueError("Not a minesweeper save file")
+    if version > FORMAT_VERSION:
+        raise ValueError("Save file version {} is newer than this reader".format(version))
+    if len(buffer) < header_size + 3 * ((width * height + 7) // 8):
+        raise ValueError("Save file is truncated")
+    return {"header_size": header_size, "width": width, "height": height, "num_mines": num_mines,
+            "seed": seed if has_seed else None, "finished": bool(finished), "win": bool(win), "loss": bool(loss),
+            "wins": wins, "losses": losses, "num_revealed": num_revealed, "num_flagged": num_flagged}
+
+
+class MappedBoard(Board):
+    """A saved board read through a memory map.
+
+    Opening takes constant time: the bitsets are views over the mapped
+    file, adjacent mine counts are worked out from the mine bits when a
+    cell is read, and the operating system only reads the pages that are
+    touched. The map is copy-on-write, so playing never changes the file;
+    use save_board to keep the progress. Call close, or use the board as a
+    context manager, to release the map.
+    """
+
+    index_zero_regions = False
+
+    def __init__(self, path: str):
+        """
+        :param path: The save file to open
+        """
+        with open(path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_COPY)
+        self._view = memoryview(self._map)
+        # Views over the bitsets, released by close
+        self._bitset_views = []
+        try:
+            self._header = read_header(self._map)
+        except ValueError:
+            self.close()
+            raise
+        super().__init__(self._header["width"], self._header["height"], self._header["num_mines"],
+                         seed=self._header["seed"])
+        self._wins = self._header["wins"]
+        self._losses = self._header["losses"]
+        self._game_state.set_game_state(self._header["finished"], self._header["win"], self._header["loss"])
+
+    def _bitset(self, position: int, count: int) -> BitSet:
+        """Returns a view over the bitset at position (0 for mines, 1 for revealed, 2 for flagged cells)."""
+
+        size = (self._total_cells + 7) // 8
+        start = self._header["header_size"] + position * size
+        view = self._view[start:start + size]
+        self._bitset_views.append(view)
+        return BitSet(self._total_cells, view, count=count)
+
+    def close(self) -> None:
+        """Releases the map. The board cannot be played afterwards."""
+
+        for view in self._bitset_views:
+            view.release()
+        self._bitset_views = []
+        self._view.release()
+        self._map.close()
+
+    def __enter__(self) -> "MappedBoard":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _init_game_board(self) -> None:
+        self._mines = self._bitset(0, self._num_mines)
+        self._cells_revealed = CoordinateBitSet(self._bitset(1, self._header["num_revealed"]),
+                                                self._width, self._height)
+        self._cells_flagged = CoordinateBitSet(self._bitset(2, self._header["num_flagged"]),
+                                               self._width, self._height)
+        self._num_revealed = self._header["num_revealed"]
+        self._num_flagged = self._header["num_flagged"]
+        self.update_mines_left()
+        self._generated = True
+
+    def reset(self) -> None:
+        """Hides every cell and removes every flag. The saved mine layout is kept."""
+
+        self._clear_cells()
+        self._game_state.reset_game_state()
+
+    def _create_cell_sets(self) -> None:
+        """Creates empty bitsets of revealed and flagged cells."""
+
+        self._cells_revealed = CoordinateBitSet(BitSet(self._total_cells), self._width, self._height)
+        self._cells_flagged = CoordinateBitSet(BitSet(self._total_cells), self._width, self._height)
+
+    def place_mines(self, indices: Iterable[int]) -> None:
+        """Replaces the mine bits in the copy-on-write map."""
+
+        indices = set(indices)
+        if len(indices) != self._num_mines:
+            raise ValueError("Expected {} mines, got {}".format(self._num_mines, len(indices)))
+        self._mines.clear()
+        for index in indices:
+            self._mines.add(index)
+        self._generated = True
+
+    def set_cell(self, coord: Coordinate, entry: Entry) -> None:
+        """Adds or removes a mine. The adjacent mine counts follow, as they are never stored."""
+
+        index = coord.row * self._width + coord.col
+        if entry.isMine():
+            self._mines.add(index)
+        else:
+            self._mines.discard(index)
+
+    def get_cell_entry(self, coord: Coordinate) -> Entry:
+        """Returns Entry object at the given index."""
+
+        return Entry.of(self.get_cell_value(coord))
+
+    def get_cell_value(self, coord: Coordinate) -> EntryValue:
+        """Returns EntryValue at the given index."""
+
+        row, col = coord
+        if not (0 <= row < self._height and 0 <= col < self._width):
+            raise IndexError("Cell outside the board")
+        index = row * self._width + col
+        mines = self._mines
+        if index in mines:
+            return EntryValue.MINE
+        count = 0
+        for offset in self._neighbors.offsets(row, col):
+            if index + offset in mines:
+                count += 1
+        return EntryValue.from_count(count)
+
+    def mine_bitset(self) -> BitSet:
+        """Returns the mapped mine BitSet."""
+
+        return self._mines
+
+    def print(self) -> None:
+        """Prints the cell values one row per line."""
+
+        self._print_cell_values()
+
+
+def load_board(path: str) -> MappedBoard:
+    """Opens a save file written by save_board."""
+
+    return MappedBoard(path)
@@ -0,0 +1,121 @@
+"""
+Plays many headless games with a strategy and reports how it did.
+
+A strategy is a picklable callable taking the Controller of a game in
+progress and a random.Random, and returning the Coordinate to reveal next.
+It may flag cells through the controller before returning.
+"""
+
+import time
+from concurrent.futures import ProcessPoolExecutor
+from random import Random
+from typing import Callable, List, NamedTuple, Sequence, Tuple, Type, Union
+
+from board import Board
+from controller import Controller
+from coordinate import Coordinate
+from difficulty import Difficulty
+
+
+Strategy = Callable[[Controller, Random], Coordinate]
+
+
+class SelfPlayResult(NamedTuple):
+    """Aggregated outcome of a self-play run."""
+
+    games: int
+    wins: int
+    moves: int
+    seconds: float
+
+    @property
+    def win_rate(self) -> float:
+        return self.wins / self.games if self.games else 0.0
+
+    @property
+    def moves_per_game(self) -> float:
+        return self.moves / self.games if self.games else 0.0
+
+    @property
+    def games_per_second(self) -> float:
+        return self.games / self.seconds if self.seconds else 0.0
+
+    def __str__(self):
+        return "Games {}, Win rate {:.2%}, Moves per game {:.1f}, Games per second {:.1f}".format(
+            self.games, self.win_rate, self.moves_per_game, self.games_per_second)
+
+
+def random_strategy(controller: Controller, rng: Random) -> Coordinate:
+    """Reveals a random cell that is neither revealed nor flagged."""
+
+    revealed, flagged = controller.board.cells_revealed(), controller.board.cells_flagged()
+    hidden = [Coordinate(row, col) for row in range(controller.height) for col in range(controller.width)
+              if Coordinate(row, col) not in revealed and Coordinate(row, col) not in flagged]
+    return rng.choice(hidden)
+
+
+def game_seeds(seed: int, num_games: int) -> List[int]:
+    """Returns the seed of every game. Depends only on the master seed, never on how games are split."""
+
+    rng = Random(seed)
+    return [rng.getrandbits(63) for _ in range(num_games)]
+
+
+def play_game(strategy: Strategy, width: int, height: int, num_mines: int, seed: int,
+              board_class: Type[Board] = Board) -> Tuple[bool, int]:
+    """Plays one game to the end. Returns whether it was won and the number of moves.
+
+    Games making no progress for width * height moves in a row count as lost.
+    """
+
+    controller = Controller(width, height, num_mines, board_class=board_class, seed=seed)
+    # Kept apart from the board's own Random(seed) so moves do not mirror the mine draw
+    rng = Random("strategy:{}".format(seed))
+    moves = 0
+    idle_moves = 0
+    while not controller.get_game_state().finished and idle_moves < width * height:
+        result = controller.reveal_decision(strategy(controller, rng))
+        moves += 1
+        idle_moves = 0 if result else idle_moves + 1
+    return controller.get_game_state().win, moves
+
+
+def _play_games(strategy: Strategy, config: Tuple[int, int, int], seeds: Sequence[int],
+                board_class: Type[Board]) -> List[Tuple[bool, int]]:
+    """Plays one game per seed. Runs inside a worker process."""
+
+    return [play_game(strategy, *config, seed, board_class) for seed in seeds]
+
+
+def self_play(strategy: Strategy, config: Union[Difficulty, Tuple[int, int, int]], num_games: int,
+              workers: int = 1, seed: int = 0, board_class: Type[Board] = Board) -> SelfPlayResult:
+    """Plays num_games games spread over a pool of worker processes.
+
+    :param strategy: Picks the next cell to reveal. Must be picklable when workers > 1
+    :param config: A Difficulty preset or a (width, height, num_mines) tuple
+    :param num_games: The number of games to play
+    :param workers: The number of worker processes. 1 plays in this process
+    :param seed: Master seed. The results only depend on it, not on the number of workers
+    :param board_class: The Board implementation to play on
+    """
+    if isinstance(config, Difficulty):
+        config = config.value
+    seeds = game_seeds(seed, num_games)
+    start = time.perf_counter()
+    if workers <= 1:
+        results = _play_games(strategy, config, seeds, board_class)
+    else:
+        batch_size = max(1, -(-num_games // (workers * 4)))
+        batches = [seeds[index:index + batch_size] for index in range(0, num_games, batch_size)]
+        results = []
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for batch_results in executor.map(_play_games, [strategy] * len(batches), [config] * len(batches),
+                                              batches, [board_class] * len(batches)):
+                results.extend(batch_results)
+    seconds = time.perf_counter() - start
+    return SelfPlayResult(num_games, sum(won for won, _ in results), sum(moves for _, moves in results), seconds)
+
+
+if __name__ == "__main__":
+    for difficulty in Difficulty:
+        print(difficulty.name, self_play(random_strategy, difficulty, 200, workers=4))
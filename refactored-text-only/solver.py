@@ -0,0 +1,162 @@
+from typing import Dict, Iterable, List, Set, Tuple
+
+from controller import Controller
+from coordinate import Coordinate
+from cellEntry import EntryValue
+from neighbors import neighbor_table
+
+
+class Solver:
+    """Deduces certain moves from the cells revealed so far.
+
+    The solver is fed the (Coordinate, EntryValue) lists returned by
+    Controller.reveal_decision. It keeps the frontier of revealed numbered
+    cells that still have hidden neighbors and only re-examines the cells
+    whose neighborhood changed since the last call. Each frontier cell is a
+    constraint: its hidden neighbors hold its number minus the mines already
+    known around it. Two rules are applied:
+
+    single cell: a constraint needing no mines makes its cells safe, and one
+    needing as many mines as it has cells makes them all mines.
+
+    subset: if the cells of one constraint are a subset of another's, the
+    extra cells hold the difference of the two numbers.
+    """
+
+    def __init__(self, width: int, height: int):
+        """
+        :param width: The horizontal span of the array
+        :param height: The vertical span of the array
+        """
+        self.width = width
+        self.height = height
+        self._steps = neighbor_table(width, height).steps
+        self._values = {}
+        self._mines = set()
+        self._safe = {}
+        self._unflagged_mines = {}
+        self._frontier = set()
+        self._dirty = {}
+
+    def _adjacent(self, coord: Coordinate) -> List[Coordinate]:
+        row, col = coord
+        return [Coordinate(row + row_step, col + col_step) for row_step, col_step in self._steps(row, col)]
+
+    def _unknown(self, coord: Coordinate) -> Tuple[Set[Coordinate], int]:
+        """Returns the undecided neighbors of a revealed cell and how many mines they hold."""
+
+        unknown = set()
+        mines = 0
+        for adjacent in self._adjacent(coord):
+            if adjacent in self._mines:
+                mines += 1
+            elif adjacent not in self._values and adjacent not in self._safe:
+                unknown.add(adjacent)
+        return unknown, self._values[coord] - mines
+
+    def _mark_around(self, coord: Coordinate) -> None:
+        """Queues the revealed neighbors of a cell for another look."""
+
+        for adjacent in self._adjacent(coord):
+            if adjacent in self._frontier:
+                self._dirty[adjacent] = None
+
+    def observe(self, result: Iterable[Tuple[Coordinate, EntryValue]]) -> None:
+        """Takes in newly revealed cells and propagates what follows from them."""
+
+        for coord, value in result:
+            if coord in self._values or value.isMine():
+                continue
+            self._values[coord] = value.value
+            self._safe.pop(coord, None)
+            if value.value > 0:
+                self._frontier.add(coord)
+                self._dirty[coord] = None
+            self._mark_around(coord)
+        self._propagate()
+
+    def _set_safe(self, cells: Iterable[Coordinate]) -> None:
+        for cell in sorted(cells):
+            if cell not in self._safe:
+                self._safe[cell] = None
+                self._mark_around(cell)
+
+    def _set_mines(self, cells: Iterable[Coordinate]) -> None:
+        for cell in sorted(cells):
+            if cell not in self._mines:
+                self._mines.add(cell)
+                self._unflagged_mines[cell] = None
+                self._mark_around(cell)
+
+    def _propagate(self) -> None:
+        while self._dirty:
+            coord = next(iter(self._dirty))
+            del self._dirty[coord]
+            unknown, needed = self._unknown(coord)
+            if not unknown:
+                self._frontier.discard(coord)
+                continue
+            if needed == 0:
+                self._set_safe(unknown)
+                continue
+            if needed == len(unknown):
+                self._set_mines(unknown)
+                continue
+            self._apply_subset_rule(coord, unknown, needed)
+
+    def _apply_subset_rule(self, coord: Coordinate, unknown: Set[Coordinate], needed: int) -> None:
+        """Compares a constraint with the frontier cells sharing a hidden cell with it."""
+
+        others = sorted({other for cell in unknown for other in self._adjacent(cell)
+                         if other != coord and other in self._frontier})
+        for other in others:
+            other_unknown, other_needed = self._unknown(other)
+            for small, small_needed, large, large_needed in (
+                    (unknown, needed, other_unknown, other_needed),
+                    (other_unknown, other_needed, unknown, needed)):
+                if small and small < large:
+                    extra, extra_mines = large - small, large_needed - small_needed
+                    if extra_mines == 0:
+                        self._set_safe(extra)
+                        return
+                    if extra_mines == len(extra):
+                        self._set_mines(extra)
+                        return
+
+    def safe_cells(self) -> List[Coordinate]:
+        """Cells known to be safe that have not been revealed yet."""
+
+        return list(self._safe)
+
+    def mine_cells(self) -> Set[Coordinate]:
+        """Cells known to hold a mine."""
+
+        return set(self._mines)
+
+    def moves(self):
+        """Yields (Coordinate, is_mine) for every certain move. Mines are yielded once, safe cells until revealed."""
+
+        while self._unflagged_mines or self._safe:
+            if self._unflagged_mines:
+                mine = next(iter(self._unflagged_mines))
+                del self._unflagged_mines[mine]
+                yield mine, True
+            else:
+                yield next(iter(self._safe)), False
+
+    def play(self, controller: Controller) -> int:
+        """Flags certain mines and reveals certain safe cells until stuck. Returns the number of reveals."""
+
+        reveals = 0
+        for coord, is_mine in self.moves():
+            if controller.get_game_state().finished:
+                break
+            if is_mine:
+                if coord not in controller.board.cells_flagged():
+                    controller.update_flagged_cell(coord)
+            else:
+                result = controller.reveal_decision(coord)
+                reveals += 1
+                self._safe.pop(coord, None)
+                self.observe(result)
+        return reveals
@@ -0,0 +1,572 @@
+import os
+import random
+import struct
+import tempfile
+import time
+import unittest
+from functools import partial
+from typing import List
+
+from arrayBoard import ArrayBoard
+from bitBoard import BitBoard
+from board import Board
+from chunkedBoard import ChunkedBoard
+from cellEntry import COUNT_ENTRIES, Entry, EntryValue
+from controller import Controller
+from coordinate import Coordinate, from_index, to_index
+from corpus import Corpus, CorpusBoard, generate_corpus
+from getAdjacent import get_adjacent
+from minePlacement import sample_mine_indices
+from neighbors import neighbor_table
+from saveFile import FORMAT_VERSION, MAGIC, MappedBoard, load_board, read_header, save_board
+
+
+def count_adjacent_mines(board: Board, coord: Coordinate) -> int:
+    return sum(board.get_cell_value(index).isMine()
+               for index in get_adjacent(coord) if board.is_valid_cell(index))
+
+
+class BoardTests:
+    """Checks shared by every Board implementation."""
+
+    board_class = Board
+
+    def setUp(self):
+        self.height = 16
+        self.width = 20
+        self.num_mines = 40
+        self.board = self.board_class(self.width, self.height, self.num_mines)
+
+    def all_coords(self):
+        return [Coordinate(row, col) for row in range(self.height) for col in range(self.width)]
+
+    def test_mine_count(self):
+        values = [self.board.get_cell_value(coord) for coord in self.all_coords()]
+        self.assertEqual(self.num_mines, values.count(EntryValue.MINE))
+
+    def test_set_adjacent_mine_count(self):
+        for coord in self.all_coords():
+            value = self.board.get_cell_value(coord)
+            if not value.isMine():
+                self.assertEqual(value.value, count_adjacent_mines(self.board, coord))
+
+    def test_reset(self):
+        self.board.add_to_revealed_cells(Coordinate(0, 0))
+        self.board.reset()
+        self.assertEqual(len(self.board.cells_revealed()), 0)
+        self.test_mine_count()
+        self.test_set_adjacent_mine_count()
+
+    def test_controller(self):
+        controller = Controller(self.width, self.height, 0, board_class=self.board_class)
+        result = controller.reveal_decision(Coordinate(3, 4))
+        self.assertEqual(len(result), self.width * self.height)
+        self.assertTrue(controller.get_game_state().win)
+
+
+    def test_safe_first_click(self):
+        controller = Controller(self.width, self.height, self.num_mines,
+                                board_class=partial(self.board_class, safe_first_click=True))
+        for _ in range(3):
+            self.assertFalse(controller.board.generated)
+            controller.update_flagged_cell(Coordinate(0, 0))
+            first_click = Coordinate(self.height - 1, 5)
+            result = controller.reveal_decision(first_click)
+            self.assertTrue(controller.board.generated)
+            self.assertEqual(controller.board.get_cell_value(first_click), EntryValue.ZERO)
+            self.assertFalse(any(value.isMine() for _, value in result))
+            self.board = controller.board
+            self.test_mine_count()
+            controller.reset()
+
+    def test_full_board_first_click(self):
+        board = self.board_class(4, 4, 15, safe_first_click=True)
+        board.generate(Coordinate(1, 1))
+        self.assertEqual(board.get_cell_value(Coordinate(1, 1)), EntryValue.EIGHT)
+
+
+    def test_incremental_counts(self):
+        controller = Controller(self.width, self.height, self.num_mines, board_class=self.board_class, seed=2)
+        board = controller.board
+        rng = random.Random(4)
+        while not controller.get_game_state().finished:
+            coord = Coordinate(rng.randrange(self.height), rng.randrange(self.width))
+            if rng.random() < 0.3:
+                controller.update_flagged_cell(coord)
+            elif coord not in board.cells_flagged():
+                controller.reveal_decision(coord)
+            self.assertEqual(board.num_revealed, len(board.cells_revealed()))
+            self.assertEqual(board.num_flagged, len(board.cells_flagged()))
+            self.assertEqual(board.mines_left, self.num_mines - len(board.cells_flagged()))
+        game_state = controller.get_game_state()
+        self.assertNotEqual(game_state.win, game_state.loss)
+        hidden_safe = [coord for coord in self.all_coords()
+                       if coord not in board.cells_revealed() and not board.get_cell_value(coord).isMine()]
+        self.assertEqual(game_state.win, not hidden_safe)
+        controller.reset()
+        self.assertEqual((board.num_revealed, board.num_flagged, board.mines_left), (0, 0, self.num_mines))
+        self.assertFalse(controller.get_game_state().finished)
+
+    def test_mine_loses(self):
+        mine = next(coord for coord in self.all_coords() if self.board.get_cell_value(coord).isMine())
+        self.board.add_to_revealed_cells(mine)
+        self.board.add_to_revealed_cells(mine)
+        self.assertEqual(self.board.num_revealed, 1)
+        game_state = self.board.get_game_state()
+        self.assertTrue(game_state.finished and game_state.loss and not game_state.win)
+
+    def test_seed(self):
+        coords = self.all_coords()
+        first = self.board_class(self.width, self.height, self.num_mines, seed=11)
+        second = self.board_class(self.width, self.height, self.num_mines, seed=11)
+        self.assertEqual([first.get_cell_value(coord) for coord in coords],
+                         [second.get_cell_value(coord) for coord in coords])
+
+
+class TestBoard(BoardTests, unittest.TestCase):
+    board_class = Board
+
+
+class TestArrayBoard(BoardTests, unittest.TestCase):
+    board_class = ArrayBoard
+
+
+class TestBitBoard(BoardTests, unittest.TestCase):
+    board_class = BitBoard
+
+    def test_cell_views(self):
+        coord = Coordinate(5, 7)
+        self.board.add_to_revealed_cells(coord)
+        self.board.add_to_cells_flagged(Coordinate(2, 3))
+        self.assertIn(coord, self.board.cells_revealed())
+        self.assertNotIn(Coordinate(7, 5), self.board.cells_revealed())
+        self.assertEqual(list(self.board.cells_revealed()), [coord])
+        self.assertEqual(self.board.mines_left, self.num_mines - 1)
+        self.assertTrue(self.board.remove_from_cells_flagged(Coordinate(2, 3)))
+        self.assertFalse(self.board.remove_from_cells_flagged(Coordinate(2, 3)))
+        self.assertEqual(len(self.board.cells_flagged()), 0)
+
+    def test_band_boundaries(self):
+        width, height = 20001, 450
+        board = BitBoard(width, height, width * height // 5)
+        for row in (0, 215, 216, 217, 431, 432, 433, height - 1):
+            for col in list(range(0, width, 997)) + [width - 1]:
+                coord = Coordinate(row, col)
+                value = board.get_cell_value(coord)
+                if not value.isMine():
+                    self.assertEqual(value.value, count_adjacent_mines(board, coord))
+
+
+class TestChunkedBoard(unittest.TestCase):
+
+    def setUp(self):
+        self.width = 64
+        self.height = 48
+        self.num_mines = 500
+        self.board = ChunkedBoard(self.width, self.height, self.num_mines, chunk_size=16, seed=7)
+
+    def test_lazy_chunks(self):
+        self.assertEqual(len(self.board.chunks), 0)
+        self.board.get_cell_value(Coordinate(20, 20))
+        self.assertEqual(list(self.board.chunks), [(1, 1)])
+
+    def test_deterministic_layout(self):
+        other = ChunkedBoard(self.width, self.height, self.num_mines, chunk_size=16, seed=7)
+        coords = [Coordinate(row, col) for row in range(self.height) for col in range(self.width)]
+        # Visit the chunks in opposite orders
+        values = [self.board.get_cell_value(coord) for coord in coords]
+        other_values = [other.get_cell_value(coord) for coord in reversed(coords)]
+        self.assertEqual(values, other_values[::-1])
+        self.assertEqual(values.count(EntryValue.MINE), self.num_mines)
+        self.board.reset()
+        self.assertNotEqual(values, [self.board.get_cell_value(coord) for coord in coords])
+
+    def test_outside_board(self):
+        for coord in (Coordinate(-1, 0), Coordinate(0, self.width), Coordinate(self.height, 0)):
+            with self.assertRaises(IndexError):
+                self.board.get_cell_value(coord)
+        self.assertEqual(len(self.board.chunks), 0)
+
+    def test_set_cell_updates_counts(self):
+        coord = Coordinate(15, 15)
+        self.board.set_cell(coord, Entry(EntryValue.ZERO))
+        before = self.board.get_cell_value(Coordinate(16, 16)).value
+        self.board.set_cell(coord, Entry(EntryValue.MINE))
+        self.assertEqual(self.board.get_cell_value(Coordinate(16, 16)).value, before + 1)
+
+    def test_adjacent_mine_count_across_chunks(self):
+        for row in range(self.height):
+            for col in range(self.width):
+                coord = Coordinate(row, col)
+                value = self.board.get_cell_value(coord)
+                if not value.isMine():
+                    self.assertEqual(value.value, count_adjacent_mines(self.board, coord))
+
+    def test_cascade_across_chunks(self):
+        size = 1 << 40
+        controller = Controller(size, size, 150 * (size // 32) ** 2, board_class=partial(ChunkedBoard, seed=3))
+        board = controller.board
+        # Find a zero on the right border of a chunk far from the origin
+        border_col = size // 2 + 31
+        row = next(row for row in range(size // 2, size // 2 + 10000)
+                   if board.get_cell_value(Coordinate(row, border_col)).isZero())
+        result = controller.reveal_decision(Coordinate(row, border_col))
+        revealed_cols = {coord.col for coord, _ in result}
+        self.assertIn(border_col + 1, revealed_cols)
+        self.assertLess(len(board.chunks), 100)
+        for coord, value in result:
+            self.assertEqual(value.value, count_adjacent_mines(board, coord))
+
+    def test_safe_first_click(self):
+        controller = Controller(self.width, self.height, self.num_mines,
+                                board_class=partial(ChunkedBoard, chunk_size=16, safe_first_click=True))
+        # The clicked cell's 3x3 area spans four chunks
+        first_click = Coordinate(15, 16)
+        for _ in range(5):
+            self.assertFalse(controller.board.generated)
+            result = controller.reveal_decision(first_click)
+            self.assertEqual(controller.board.get_cell_value(first_click), EntryValue.ZERO)
+            self.assertFalse(any(value.isMine() for _, value in result))
+            values = [controller.board.get_cell_value(Coordinate(row, col))
+                      for row in range(self.height) for col in range(self.width)]
+            self.assertEqual(values.count(EntryValue.MINE), self.num_mines)
+            controller.reset()
+
+    def test_cascade_without_mines(self):
+        controller = Controller(self.width, self.height, 0,
+                                board_class=partial(ChunkedBoard, chunk_size=16))
+        result = controller.reveal_decision(Coordinate(0, 0))
+        self.assertEqual(len(result), self.width * self.height)
+        self.assertTrue(controller.get_game_state().win)
+
+
+class TestCellEntry(unittest.TestCase):
+
+    def test_predicates(self):
+        for value in EntryValue:
+            number = value.value if type(value.value) is int else None
+            self.assertEqual(value.isNum(), number is not None and number >= 0)
+            self.assertEqual(value.is_num_and_g_t_zero(), number is not None and number > 0)
+            self.assertEqual(value.isZero(), number == 0)
+            self.assertEqual(value.isMine(), number == -1)
+
+    def test_shared_entries(self):
+        for count in range(9):
+            self.assertIs(EntryValue.from_count(count), EntryValue(count))
+            self.assertIs(COUNT_ENTRIES[count], Entry.of(EntryValue(count)))
+        self.assertIs(Entry.of(EntryValue.MINE).value, EntryValue.MINE)
+        self.assertTrue(Entry.of(EntryValue.MINE).isMine())
+        board = Board(12, 9, 20, seed=1)
+        entries = {id(board.get_cell_entry(Coordinate(row, col))) for row in range(9) for col in range(12)}
+        self.assertLessEqual(len(entries), 10)
+        with self.assertRaises(TypeError):
+            Entry(3)
+
+    def test_coordinate_index(self):
+        for index in range(35):
+            coord = from_index(index, 7)
+            self.assertEqual(coord, Coordinate(*divmod(index, 7)))
+            self.assertIsInstance(coord, Coordinate)
+            self.assertEqual(to_index(coord, 7), index)
+
+
+class TestNeighborTable(unittest.TestCase):
+
+    def test_matches_get_adjacent(self):
+        for width, height in [(1, 1), (1, 4), (5, 1), (2, 2), (7, 5)]:
+            table = neighbor_table(width, height)
+            board = Board(width, height, 0)
+            for row in range(height):
+                for col in range(width):
+                    expected = {coord for coord in get_adjacent(Coordinate(row, col)) if board.is_valid_cell(coord)}
+                    steps = table.steps(row, col)
+                    self.assertEqual(len(steps), len(expected))
+                    self.assertEqual({Coordinate(row + row_step, col + col_step) for row_step, col_step in steps},
+                                     expected)
+                    index = row * width + col
+                    self.assertEqual(set(table.neighbors(index)), {to_index(coord, width) for coord in expected})
+                    self.assertEqual({index + offset for offset in table.offsets(row, col)},
+                                     set(table.neighbors(index)))
+
+    def test_shared(self):
+        self.assertIs(neighbor_table(9, 4), neighbor_table(9, 4))
+        self.assertIs(Board(9, 4, 3).neighbors, neighbor_table(9, 4))
+        table = neighbor_table(9, 4)
+        self.assertIs(table.offsets(1, 1), table.offsets(2, 7))
+
+    def test_huge_shape(self):
+        size = 1 << 40
+        table = neighbor_table(size, size)
+        self.assertEqual(len(table.offsets(size - 1, 5)), 5)
+        self.assertEqual(len(table.offsets(size // 2, size // 2)), 8)
+
+
+class TestSampleMineIndices(unittest.TestCase):
+
+    def check_sample(self, total_cells, num_mines, excluded):
+        indices = sample_mine_indices(total_cells, num_mines, random.Random(1), excluded)
+        self.assertEqual(len(indices), num_mines)
+        self.assertEqual(len(set(indices)), num_mines)
+        self.assertTrue(all(0 <= index < total_cells for index in indices))
+        self.assertFalse(set(indices) & set(excluded))
+        return indices
+
+    def test_sparse(self):
+        self.check_sample(10 ** 12, 1000, [0, 5, 10 ** 12 - 1])
+
+    def test_dense(self):
+        indices = self.check_sample(100, 91, range(40, 49))
+        self.assertEqual(set(indices), set(range(100)) - set(range(40, 49)))
+
+    def test_reproducible(self):
+        self.assertEqual(sample_mine_indices(500, 60, random.Random(4)),
+                         sample_mine_indices(500, 60, random.Random(4)))
+
+    def test_leaves_global_state(self):
+        random.seed(2)
+        expected = random.random()
+        random.seed(2)
+        Controller(30, 16, 99, seed=8)
+        self.assertEqual(random.random(), expected)
+
+
+class TestZeroRegionIndex(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(5)
+        self.controller = Controller(30, 16, 60)
+        self.board = self.controller.board
+
+    def zero_cells(self):
+        return [Coordinate(row, col) for row in range(16) for col in range(30)
+                if self.board.get_cell_value(Coordinate(row, col)).isZero()]
+
+    def test_matches_bfs(self):
+        for _ in range(5):
+            zeroes = self.zero_cells()
+            for coord in zeroes:
+                self.board._clear_cells()
+                expected = self.controller.reveal_zeroes_bfs(coord)
+                self.board._clear_cells()
+                result = self.controller.reveal_zeroes(coord)
+                self.assertEqual(set(result), set(expected))
+                self.assertEqual(len(result), len(expected))
+            self.board.reset()
+
+    def test_skips_revealed_and_flagged(self):
+        coord = self.zero_cells()[0]
+        region = self.board.zero_region(coord)
+        self.board.add_to_cells_flagged(region[-1])
+        result = self.controller.reveal_decision(coord)
+        self.assertEqual({cell for cell, _ in result}, set(region[:-1]))
+        self.assertEqual(self.controller.reveal_decision(region[0]), [])
+
+    def test_bfs_skips_flagged(self):
+        coord = self.zero_cells()[0]
+        region = self.board.zero_region(coord)
+        for cell in region[:2] + region[-1:]:
+            self.board.add_to_cells_flagged(cell)
+        result = self.controller.reveal_zeroes_bfs(coord)
+        self.assertEqual(set(result), {(cell, self.board.get_cell_value(cell)) for cell in region[2:-1]})
+
+    def test_not_indexed(self):
+        number = next(Coordinate(row, col) for row in range(16) for col in range(30)
+                      if not self.board.get_cell_value(Coordinate(row, col)).isZero())
+        self.assertIsNone(self.board.zero_region(number))
+        self.assertIsNone(BitBoard(10, 10, 0).zero_region(Coordinate(0, 0)))
+
+
+class TestSaveFile(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "board.msw")
+
+    def play(self, controller: Controller, seed: int, moves: int) -> List:
+        rng = random.Random(seed)
+        results = []
+        for _ in range(moves):
+            coord = Coordinate(rng.randrange(controller.height), rng.randrange(controller.width))
+            if rng.random() < 0.3:
+                results.append(controller.update_flagged_cell(coord))
+            else:
+                results.append(sorted(controller.reveal_decision(coord)))
+        return results
+
+    def assert_same_board(self, board: Board, loaded: Board):
+        self.assertEqual((loaded.width, loaded.height, loaded.num_mines, loaded.seed),
+                         (board.width, board.height, board.num_mines, board.seed))
+        self.assertEqual((loaded.wins, loaded.losses, loaded.num_revealed, loaded.num_flagged, loaded.mines_left),
+                         (board.wins, board.losses, board.num_revealed, board.num_flagged, board.mines_left))
+        self.assertEqual(str(loaded.get_game_state()), str(board.get_game_state()))
+        self.assertEqual(set(loaded.cells_revealed()), set(board.cells_revealed()))
+        self.assertEqual(set(loaded.cells_flagged()), set(board.cells_flagged()))
+        for row in range(board.height):
+            for col in range(board.width):
+                self.assertEqual(loaded.get_cell_value(Coordinate(row, col)), board.get_cell_value(Coordinate(row, col)))
+
+    def test_round_trip(self):
+        for board_class in (Board, ArrayBoard, BitBoard, partial(ChunkedBoard, chunk_size=8)):
+            controller = Controller(24, 16, 50, board_class=board_class, seed=6)
+            controller.increment_wins()
+            self.play(controller, 1, 12)
+            save_board(controller.board, self.path)
+            with load_board(self.path) as loaded:
+                self.assertIsInstance(loaded, MappedBoard)
+                self.assert_same_board(controller.board, loaded)
+
+                # Both continue the same way, and playing on the loaded board leaves the file alone
+                resumed = Controller.from_board(loaded)
+                self.assertEqual(self.play(resumed, 2, 12), self.play(controller, 2, 12))
+                self.assert_same_board(controller.board, loaded)
+                with open(self.path, "rb") as file, load_board(self.path) as reloaded:
+                    self.assertEqual(read_header(file.read())["num_revealed"], reloaded.num_revealed)
+                save_board(loaded, self.path)
+            with load_board(self.path) as saved:
+                self.assert_same_board(controller.board, saved)
+
+    def test_reset_keeps_layout(self):
+        controller = Controller(10, 10, 20, seed=4)
+        self.play(controller, 3, 10)
+        save_board(controller.board, self.path)
+        with load_board(self.path) as loaded:
+            loaded.reset()
+            self.assertEqual((loaded.num_revealed, loaded.num_flagged, loaded.mines_left), (0, 0, 20))
+            self.assertFalse(loaded.get_game_state().finished)
+            self.assertEqual(loaded.mine_bitset().buffer, controller.board.mine_bitset().buffer)
+
+    def test_close(self):
+        save_board(Board(6, 6, 5, seed=2), self.path)
+        loaded = load_board(self.path)
+        loaded.get_cell_value(Coordinate(1, 1))
+        loaded.close()
+        self.assertTrue(loaded._map.closed)
+
+    def test_invalid_files(self):
+        with open(self.path, "wb") as file:
+            file.write(b"not a save file at all, but long enough for the header checks" * 2)
+        with self.assertRaises(ValueError):
+            load_board(self.path)
+        save_board(Board(5, 5, 3, seed=1), self.path)
+        with open(self.path, "r+b") as file:
+            file.seek(4)
+            file.write(struct.pack("<H", FORMAT_VERSION + 1))
+        with self.assertRaises(ValueError):
+            load_board(self.path)
+        save_board(Board(5, 5, 3, seed=1), self.path)
+        with open(self.path, "r+b") as file:
+            file.truncate(os.path.getsize(self.path) - 1)
+        with self.assertRaises(ValueError):
+            load_board(self.path)
+        with self.assertRaises(ValueError):
+            save_board(Board(5, 5, 3, safe_first_click=True), self.path)
+
+    def test_large_board_opens_instantly(self):
+        size = 10000
+        save_board(Board(8, 8, 0, seed=1), self.path)
+        with open(self.path, "rb") as file:
+            data = file.read()
+        header = data[:read_header(data)["header_size"]]
+        with open(self.path, "r+b") as file:
+            file.write(header[:8] + struct.pack("<QQQ", size, size, 1) + header[32:])
+            file.truncate(len(header) + 3 * (size * size // 8))
+            mine = 5000 * size + 1234
+            file.seek(len(header) + mine // 8)
+            file.write(bytes([1 << (mine % 8)]))
+        start = time.perf_counter()
+        board = load_board(self.path)
+        self.addCleanup(board.close)
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertTrue(board.get_cell_value(Coordinate(5000, 1234)).isMine())
+        self.assertEqual(board.get_cell_value(Coordinate(4999, 1235)), EntryValue.ONE)
+        self.assertEqual(board.get_cell_value(Coordinate(5000, 1236)), EntryValue.ZERO)
+        self.assertEqual(board.mines_left, 1)
+
+
+class TestCorpus(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def generate(self, name: str, *args, **kwargs) -> str:
+        path = os.path.join(self.directory, name)
+        generate_corpus(path, *args, **kwargs)
+        return path
+
+    def test_boards(self):
+        # An odd number of cells leaves half a byte of counts unused
+        corpus = Corpus(self.generate("odd.mswc", 7, 5, 9, 300, seed=3))
+        self.addCleanup(corpus.close)
+        self.assertEqual((len(corpus), corpus.width, corpus.height, corpus.num_mines, corpus.seed), (300, 7, 5, 9, 3))
+        layouts = corpus.mines()
+        self.assertEqual(layouts.shape, (300, 5, 7))
+        self.assertTrue((layouts.sum(axis=(1, 2)) == 9).all())
+        self.assertGreater(len({layout.tobytes() for layout in layouts}), 290)
+        for index, board in enumerate(corpus):
+            self.assertIsInstance(board, CorpusBoard)
+            expected = Board(7, 5, 9)
+            expected.place_mines(board.mine_bitset())
+            for row in range(5):
+                for col in range(7):
+                    coord = Coordinate(row, col)
+                    self.assertEqual(board.get_cell_value(coord), expected.get_cell_value(coord))
+                    self.assertEqual(board.get_cell_value(coord).isMine(), layouts[index, row, col])
+        self.assertEqual(corpus[-1].mine_bitset().buffer.tobytes(), corpus[299].mine_bitset().buffer.tobytes())
+        with self.assertRaises(IndexError):
+            corpus[300]
+        self.assertEqual(corpus.mines(298, 1000).shape, (2, 5, 7))
+        self.assertEqual(corpus.mines(300).shape, (0, 5, 7))
+        for start, stop in ((-1, None), (301, None), (5, 4)):
+            with self.assertRaises(IndexError):
+                corpus.mines(start, stop)
+
+    def test_play_and_reset(self):
+        with Corpus(self.generate("play.mswc", 9, 9, 10, 3, seed=1)) as corpus:
+            board = corpus[1]
+        layout = board.mine_bitset().buffer.tobytes()
+        controller = Controller.from_board(board)
+        safe = next(Coordinate(row, col) for row in range(9) for col in range(9)
+                    if not board.get_cell_value(Coordinate(row, col)).isMine())
+        self.assertTrue(controller.reveal_decision(safe))
+        controller.reset()
+        self.assertEqual(board.num_revealed, 0)
+        self.assertEqual(board.mine_bitset().buffer.tobytes(), layout)
+
+    def test_close(self):
+        with Corpus(self.generate("close.mswc", 8, 8, 10, 5)) as corpus:
+            board = corpus[0]
+        layout = board.mine_bitset().buffer.tobytes()
+        self.assertEqual(len(layout), 8)
+        with self.assertRaises(ValueError):
+            corpus[0]
+        with self.assertRaises(ValueError):
+            corpus.mines()
+
+    def test_independent_of_workers(self):
+        # 1200 cells a board gives chunks of 873 boards, so 2000 boards span three chunks
+        single = self.generate("single.mswc", 40, 30, 200, 2000, seed=7)
+        parallel = self.generate("parallel.mswc", 40, 30, 200, 2000, seed=7, workers=2)
+        other_seed = self.generate("other.mswc", 40, 30, 200, 2000, seed=8)
+        with open(single, "rb") as first, open(parallel, "rb") as second, open(other_seed, "rb") as third:
+            single_bytes = first.read()
+            self.assertEqual(single_bytes, second.read())
+            self.assertNotEqual(single_bytes[-1000:], third.read()[-1000:])
+
+    def test_invalid_files(self):
+        path = os.path.join(self.directory, "bad.mswc")
+        with open(path, "wb") as file:
+            file.write(b"MSWP" + bytes(100))
+        with self.assertRaises(ValueError):
+            Corpus(path)
+        path = self.generate("cut.mswc", 8, 8, 10, 10)
+        with open(path, "r+b") as file:
+            file.truncate(os.path.getsize(path) - 1)
+        with self.assertRaises(ValueError):
+            Corpus(path)
+
+
+if __name__ == "__main__":
+    unittest.main()
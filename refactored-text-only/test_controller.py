@@ -0,0 +1,407 @@
+import functools
+import io
+import os
+import random
+import re
+import tempfile
+import time
+import unittest
+from typing import List
+
+import numpy as np
+
+import profiling
+
+from batchBoard import BatchBoard, LOSS, ONGOING, WIN
+from board import Board
+from chunkedBoard import ChunkedBoard
+from controller import Controller
+from coordinate import Coordinate
+from difficulty import Difficulty
+from moveLog import Action, LoggedController, Replayer
+from selfPlay import random_strategy, self_play
+from views import AnsiTextView
+
+
+def board_layout(controller: Controller) -> np.ndarray:
+    return np.array([[controller.board.get_cell_value(Coordinate(row, col)).isMine()
+                      for col in range(controller.width)] for row in range(controller.height)])
+
+
+def controller_status(controller: Controller) -> int:
+    game_state = controller.get_game_state()
+    if not game_state.finished:
+        return ONGOING
+    return WIN if game_state.win else LOSS
+
+
+class TestBatchBoard(unittest.TestCase):
+
+    def setUp(self):
+        self.width = 9
+        self.height = 7
+        self.num_mines = 8
+        self.controllers = [Controller(self.width, self.height, self.num_mines, seed=seed) for seed in range(40)]
+        self.batch = BatchBoard(self.width, self.height, self.num_mines, len(self.controllers),
+                                mines=np.stack([board_layout(controller) for controller in self.controllers]))
+
+    def test_counts(self):
+        for layer, controller in zip(self.batch.counts, self.controllers):
+            for row in range(self.height):
+                for col in range(self.width):
+                    self.assertEqual(layer[row, col], controller.board.get_cell_value(Coordinate(row, col)).value)
+
+    def test_matches_controller(self):
+        rng = random.Random(3)
+        for _ in range(60):
+            # Even boards only click hidden safe cells so that some games are won
+            moves = [rng.choice(np.argwhere(~self.batch.mines[board] & ~self.batch.revealed[board]).tolist() or [[0, 0]])
+                     if board % 2 == 0 else [rng.randrange(self.height), rng.randrange(self.width)]
+                     for board in range(len(self.controllers))]
+            rows = [row for row, _ in moves]
+            cols = [col for _, col in moves]
+            flags = [rng.random() < 0.2 for _ in self.controllers]
+            status = self.batch.step(rows, cols, flags)
+            for board, controller in enumerate(self.controllers):
+                if controller_status(controller) == ONGOING:
+                    coord = Coordinate(rows[board], cols[board])
+                    if flags[board]:
+                        controller.update_flagged_cell(coord)
+                    else:
+                        controller.reveal_decision(coord)
+                self.assertEqual(status[board], controller_status(controller))
+                revealed = {Coordinate(int(row), int(col)) for row, col in np.argwhere(self.batch.revealed[board])}
+                flagged = {Coordinate(int(row), int(col)) for row, col in np.argwhere(self.batch.flagged[board])}
+                self.assertEqual(revealed, set(controller.board.cells_revealed()))
+                self.assertEqual(flagged, set(controller.board.cells_flagged()))
+        self.assertTrue({WIN, LOSS} <= set(status.tolist()))
+
+    def test_random_layouts(self):
+        batch = BatchBoard(30, 16, 99, 50, seed=1)
+        self.assertTrue((batch.mines.sum(axis=(1, 2)) == 99).all())
+        self.assertTrue((batch.mines_left() == 99).all())
+        batch.reset()
+        self.assertTrue((batch.mines.sum(axis=(1, 2)) == 99).all())
+
+
+class TestSelfPlay(unittest.TestCase):
+
+    def test_independent_of_workers(self):
+        single = self_play(random_strategy, Difficulty.EASY, 40, workers=1, seed=9)
+        pooled = self_play(random_strategy, Difficulty.EASY, 40, workers=3, seed=9)
+        self.assertEqual(single[:3], pooled[:3])
+        self.assertEqual(single.games, 40)
+        self.assertGreater(single.moves_per_game, 0)
+
+    def test_custom_size(self):
+        result = self_play(random_strategy, (5, 4, 0), 6, seed=1)
+        self.assertEqual(result.win_rate, 1.0)
+        self.assertEqual(result.moves_per_game, 1.0)
+
+
+class TestProfiling(unittest.TestCase):
+
+    def tearDown(self):
+        profiling.disable()
+        profiling.reset()
+
+    def test_counts_calls(self):
+        original = Controller.reveal_decision
+        profiling.enable()
+        self.assertIsNot(Controller.reveal_decision, original)
+        controller = Controller(10, 10, 0)
+        controller.reveal_decision(Coordinate(0, 0))
+        controller.reveal_decision(Coordinate(0, 0))
+        stats = profiling.stats()
+        self.assertEqual(stats["Controller.reveal_decision"].calls, 2)
+        self.assertEqual(stats["Board._set_adjacent_mine_count"].calls, 1)
+        self.assertGreaterEqual(stats["Controller.reveal_decision"].total, stats["Controller.reveal_decision"].max)
+        self.assertIn("Controller.reveal_zeroes", profiling.report())
+        profiling.reset()
+        self.assertEqual(profiling.stats()["Controller.reveal_decision"].calls, 0)
+
+    def test_disable_restores_methods(self):
+        original = Board.get_cell_value
+        profiling.enable()
+        profiling.enable()
+        profiling.disable()
+        self.assertIs(Board.get_cell_value, original)
+        self.assertFalse(profiling.is_enabled())
+
+
+class TestHistory(unittest.TestCase):
+
+    def setUp(self):
+        self.controller = Controller(16, 12, 25, seed=8)
+        self.rng = random.Random(2)
+
+    def state(self):
+        board = self.controller.board
+        game_state = self.controller.get_game_state()
+        return (set(board.cells_revealed()), set(board.cells_flagged()), board.num_revealed, board.mines_left,
+                (game_state.finished, game_state.win, game_state.loss))
+
+    def play(self, moves: int) -> List[tuple]:
+        """Plays random moves, returning the state after each one that changed something."""
+
+        states = []
+        while len(states) < moves and not self.controller.get_game_state().finished:
+            coord = Coordinate(self.rng.randrange(12), self.rng.randrange(16))
+            if self.rng.random() < 0.3:
+                changed = self.controller.update_flagged_cell(coord)
+            else:
+                changed = self.controller.reveal_decision(coord)
+                if any(value.isMine() for _, value in changed):
+                    # The game over reveal is a move of its own
+                    states.append(self.state())
+                    self.controller.reveal_all_cells()
+            if changed:
+                states.append(self.state())
+        return states
+
+    def test_undo_redo(self):
+        start = self.state()
+        states = self.play(30)
+        for expected in reversed([start] + states[:-1]):
+            self.assertIsNotNone(self.controller.undo())
+            self.assertEqual(self.state(), expected)
+        self.assertIsNone(self.controller.undo())
+        for expected in states:
+            self.assertIsNotNone(self.controller.redo())
+            self.assertEqual(self.state(), expected)
+        self.assertIsNone(self.controller.redo())
+
+    def test_move_clears_redo(self):
+        self.play(5)
+        self.controller.undo()
+        self.controller.update_flagged_cell(Coordinate(0, 0))
+        self.controller.update_flagged_cell(Coordinate(0, 0))
+        self.assertIsNone(self.controller.redo())
+
+    def test_delta_only(self):
+        self.controller.update_flagged_cell(Coordinate(3, 3))
+        move = self.controller.last_move
+        self.assertEqual((move.revealed, move.flagged, move.unflagged), ((), (Coordinate(3, 3),), ()))
+        result = self.controller.reveal_decision(Coordinate(5, 5))
+        self.assertEqual(self.controller.last_move.revealed, tuple(coord for coord, _ in result))
+        self.assertIs(self.controller.last_move.parent, move)
+
+    def test_snapshots_across_branches(self):
+        self.controller.snapshot("start")
+        start = self.state()
+        self.play(3)
+        self.controller.snapshot("a")
+        state_a = self.state()
+        self.play(6)
+        self.controller.snapshot("b")
+        state_b = self.state()
+        self.controller.restore("a")
+        self.assertEqual(self.state(), state_a)
+        self.play(6)
+        self.controller.snapshot("c")
+        state_c = self.state()
+        for name, expected in [("b", state_b), ("c", state_c), ("start", start), ("b", state_b)]:
+            self.controller.restore(name)
+            self.assertEqual(self.state(), expected)
+        with self.assertRaises(KeyError):
+            self.controller.restore("missing")
+        self.controller.reset()
+        self.assertIsNone(self.controller.undo())
+        self.assertEqual(self.controller.snapshots(), {})
+
+
+def render(text: str, screen: List[List[str]]) -> None:
+    """Applies the cursor moves, clears and text of an AnsiTextView frame to screen."""
+
+    row = col = 0
+    for match in re.finditer(r"\x1b\[([\d;]*)([A-Za-z])|(\n)|(.)", text, re.S):
+        params, command, newline, char = match.groups()
+        if command == "H":
+            numbers = [int(number) for number in params.split(";")] if params else [1, 1]
+            row, col = numbers[0] - 1, numbers[1] - 1
+        elif command == "J" and params == "2":
+            del screen[:]
+        elif command == "J":
+            del screen[row + 1:]
+            if row < len(screen):
+                del screen[row][col:]
+        elif command == "K":
+            if row < len(screen):
+                del screen[row][col:]
+        elif newline:
+            row, col = row + 1, 0
+        else:
+            while len(screen) <= row:
+                screen.append([])
+            line = screen[row]
+            line.extend(" " * (col + 1 - len(line)))
+            line[col] = char
+            col += 1
+
+
+class TestMoveLog(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "game.mswl")
+
+    def play(self, controller: Controller, seed: int, moves: int, keep_states: bool = True) -> List:
+        """Plays random moves with a reset every 500, returning the state after each move if keep_states."""
+
+        rng = random.Random(seed)
+        states = []
+        for move in range(moves):
+            coord = Coordinate(rng.randrange(controller.height), rng.randrange(controller.width))
+            if move % 500 == 499:
+                controller.reset()
+            elif rng.random() < 0.3:
+                controller.update_flagged_cell(coord)
+            else:
+                controller.reveal_decision(coord)
+            if keep_states:
+                states.append(self.state(controller))
+        return states
+
+    def state(self, controller: Controller):
+        board = controller.board
+        return set(board.cells_revealed()), set(board.cells_flagged()), str(board.get_game_state())
+
+    def test_replay(self):
+        for board_class in (Board, functools.partial(Board, safe_first_click=True)):
+            controller = LoggedController(30, 30, 90, self.path, board_class=board_class, seed=5)
+            states = self.play(controller, 1, 2000)
+            controller.close()
+            replayer = Replayer(self.path)
+            entries = list(replayer)
+            self.assertEqual(len(entries), 2000)
+            self.assertEqual([entry.move for entry in entries], list(range(1, 2001)))
+            self.assertEqual(entries[499].action, Action.RESET)
+            self.assertIsNone(entries[499].coord)
+            self.assertEqual(self.state(replayer.controller), states[-1])
+            replayer.close()
+            os.remove(self.path)
+
+    def test_seek(self):
+        controller = LoggedController(30, 30, 90, self.path, seed=5, keyframe_interval=64)
+        states = self.play(controller, 2, 1500)
+        controller.close()
+        replayer = Replayer(self.path)
+        self.addCleanup(replayer.close)
+        for position in (1200, 7, 1500, 64, 1499, 640, 641, 500, 3):
+            self.assertEqual(replayer.seek(position), position)
+            self.assertEqual(self.state(replayer.controller), states[position - 1], position)
+        self.assertEqual(replayer.seek(5000), 1500)
+        self.assertEqual(replayer.keyframes(), list(range(64, 1500, 64)))
+        replayer.seek(0)
+        self.assertEqual(self.state(replayer.controller), (set(), set(), str(Board(1, 1, 0).get_game_state())))
+
+    def test_append_and_torn_record(self):
+        controller = LoggedController(10, 10, 10, self.path, seed=1)
+        self.play(controller, 3, 50)
+        controller.close()
+        with open(self.path, "ab") as file:
+            file.write(b"\x02\x00\x01")
+        controller = LoggedController(10, 10, 10, self.path, seed=2)
+        states = self.play(controller, 4, 50)
+        controller.close()
+        replayer = Replayer(self.path)
+        self.addCleanup(replayer.close)
+        self.assertEqual(len(list(replayer)), 101)
+        self.assertEqual(self.state(replayer.controller), states[-1])
+        with self.assertRaises(ValueError):
+            LoggedController(10, 10, 11, self.path)
+
+    def test_rejects_chunked_boards(self):
+        with self.assertRaises(TypeError):
+            LoggedController(64, 64, 100, self.path, board_class=functools.partial(ChunkedBoard, chunk_size=16))
+        self.assertFalse(os.path.exists(self.path))
+        LoggedController(8, 8, 10, self.path, seed=1).close()
+        with self.assertRaises(TypeError):
+            Replayer(self.path, board_class=ChunkedBoard)
+        with self.assertRaises(TypeError):
+            ChunkedBoard(64, 64, 100).place_mines(range(100))
+
+    def test_replay_speed(self):
+        controller = LoggedController(50, 50, 250, self.path, seed=6)
+        self.play(controller, 5, 10000, keep_states=False)
+        controller.close()
+        replayer = Replayer(self.path)
+        self.addCleanup(replayer.close)
+        start = time.perf_counter()
+        self.assertEqual(sum(1 for _ in replayer), 10000)
+        self.assertLess(time.perf_counter() - start, 1.0)
+
+
+class TestAnsiTextView(unittest.TestCase):
+
+    def screen_text(self, screen: List[List[str]]) -> str:
+        return "\n".join("".join(line) for line in screen)
+
+    def test_incremental_frames_match_full_redraw(self):
+        controller = Controller(12, 11, 15, seed=3)
+        output = io.StringIO()
+        view = AnsiTextView(12, 11, 15, controller=controller, play=False, output=output)
+        screen = []
+        view.show_grid()
+        render(output.getvalue(), screen)
+        rng = random.Random(5)
+        for _ in range(30):
+            coord = Coordinate(rng.randrange(11), rng.randrange(12))
+            if rng.random() < 0.3:
+                flagged = controller.update_flagged_cell(coord)
+                if flagged == 1:
+                    view.flag_cell(coord)
+                elif flagged == -1:
+                    view.unflag_cell(coord)
+            else:
+                result = controller.reveal_decision(coord)
+                if rng.random() < 0.5:
+                    view.reveal_cells(result)
+                else:
+                    for output_coord, value in result:
+                        view.reveal_cell(output_coord, value)
+            output.seek(0)
+            output.truncate()
+            view.show_grid()
+            frame = output.getvalue()
+            self.assertNotIn("\x1b[2J", frame)
+            render(frame, screen)
+
+            full_output = io.StringIO()
+            full = AnsiTextView(12, 11, 15, controller=controller, play=False, output=full_output)
+            full.cell_view = [list(cells) for cells in view.cell_view]
+            full.show_grid()
+            full_screen = []
+            render(full_output.getvalue(), full_screen)
+            self.assertEqual(self.screen_text(screen), self.screen_text(full_screen))
+            if controller.get_game_state().finished:
+                break
+
+    def test_unchanged_cells_are_not_written(self):
+        output = io.StringIO()
+        view = AnsiTextView(5, 5, 0, play=False, output=output)
+        view.show_grid()
+        output.seek(0)
+        output.truncate()
+        view.flag_cell(Coordinate(1, 2))
+        view.unflag_cell(Coordinate(1, 2))
+        view.show_grid()
+        self.assertNotIn("cell", output.getvalue())
+        self.assertNotIn("FLAG", output.getvalue())
+
+    def test_only_dirty_rows_are_formatted(self):
+        view = AnsiTextView(5, 5, 0, play=False, output=io.StringIO())
+        view.show_grid()
+        rows = list(view._row_cache)
+        view.flag_cell(Coordinate(3, 1))
+        view.show_grid()
+        for row in range(5):
+            if row == 3:
+                self.assertNotEqual(view._row_cache[row], rows[row])
+            else:
+                self.assertIs(view._row_cache[row], rows[row])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,204 @@
+import time
+import unittest
+from concurrent.futures import Future
+from itertools import combinations
+from functools import partial
+from unittest import mock
+
+from board import Board
+from cellEntry import EntryValue
+from controller import Controller
+from coordinate import Coordinate
+from difficulty import Difficulty
+import noGuess
+from noGuess import NoGuessBoard, NoGuessPool, generate_no_guess, play_without_guessing
+from probability import mine_probabilities
+from solver import Solver
+
+
+def start_game(seed: int, width: int = 30, height: int = 16, num_mines: int = 99) -> Controller:
+    return Controller(width, height, num_mines, board_class=partial(Board, safe_first_click=True), seed=seed)
+
+
+class TestSolver(unittest.TestCase):
+
+    def test_deductions_are_correct(self):
+        wins = 0
+        for seed in range(30):
+            controller = start_game(seed)
+            solver = Solver(controller.width, controller.height)
+            solver.observe(controller.reveal_decision(Coordinate(8, 15)))
+            solver.play(controller)
+            state = controller.get_game_state()
+            self.assertFalse(state.finished and not state.win)
+            wins += state.win
+            for mine in solver.mine_cells():
+                self.assertTrue(controller.board.get_cell_value(mine).isMine())
+                self.assertIn(mine, controller.board.cells_flagged())
+            for cell in solver.safe_cells():
+                self.assertFalse(controller.board.get_cell_value(cell).isMine())
+        self.assertGreater(wins, 0)
+
+    def test_matches_solving_from_scratch(self):
+        for seed in range(10):
+            controller = start_game(seed, 16, 16, 40)
+            solver = Solver(controller.width, controller.height)
+            solver.observe(controller.reveal_decision(Coordinate(8, 8)))
+            solver.play(controller)
+            fresh = Solver(controller.width, controller.height)
+            fresh.observe((coord, controller.board.get_cell_value(coord))
+                          for coord in controller.board.cells_revealed())
+            self.assertEqual(fresh.mine_cells(), solver.mine_cells())
+            self.assertEqual(fresh.safe_cells(), [])
+
+    def test_subset_rule(self):
+        # Three ones over three hidden cells: no single cell is certain, but
+        # the outer ones are subsets of the middle one
+        solver = Solver(3, 2)
+        solver.observe([(Coordinate(0, col), EntryValue.ONE) for col in range(3)])
+        self.assertEqual(solver.mine_cells(), {Coordinate(1, 1)})
+        self.assertEqual(sorted(solver.safe_cells()), [Coordinate(1, 0), Coordinate(1, 2)])
+
+
+def brute_force_probabilities(board: Board):
+    revealed, flagged = board.cells_revealed(), board.cells_flagged()
+    hidden = [Coordinate(row, col) for row in range(board.height) for col in range(board.width)
+              if Coordinate(row, col) not in revealed and Coordinate(row, col) not in flagged]
+    mine_counts = dict.fromkeys(hidden, 0)
+    layouts = 0
+    for mines in combinations(hidden, board.mines_left):
+        mines = set(mines) | set(flagged)
+        if all(sum(Coordinate(coord.row + row, coord.col + col) in mines
+                   for row in (-1, 0, 1) for col in (-1, 0, 1)) == board.get_cell_value(coord).value
+               for coord in revealed):
+            layouts += 1
+            for mine in mines - set(flagged):
+                mine_counts[mine] += 1
+    return {cell: count / layouts for cell, count in mine_counts.items()}
+
+
+class TestMineProbabilities(unittest.TestCase):
+
+    def test_matches_brute_force(self):
+        for seed in range(8):
+            controller = start_game(seed, 6, 5, 7)
+            solver = Solver(controller.width, controller.height)
+            solver.observe(controller.reveal_decision(Coordinate(0, 0)))
+            solver.play(controller)
+            if controller.get_game_state().finished:
+                continue
+            probabilities = mine_probabilities(controller.board)
+            expected = brute_force_probabilities(controller.board)
+            self.assertEqual(probabilities.keys(), expected.keys())
+            for cell, probability in expected.items():
+                self.assertAlmostEqual(probabilities[cell], probability)
+
+    def test_agrees_with_solver(self):
+        controller = start_game(4)
+        solver = Solver(controller.width, controller.height)
+        solver.observe(controller.reveal_decision(Coordinate(8, 15)))
+        solver.play(controller)
+        # Unflag the solver's mines so the probabilities have to find them again
+        for mine in solver.mine_cells():
+            controller.update_flagged_cell(mine)
+        probabilities = mine_probabilities(controller.board)
+        for mine in solver.mine_cells():
+            self.assertAlmostEqual(probabilities[mine], 1.0)
+        self.assertAlmostEqual(sum(probabilities.values()), controller.board.mines_left)
+
+    def test_expert_speed(self):
+        for seed in range(10):
+            controller = start_game(seed)
+            solver = Solver(controller.width, controller.height)
+            solver.observe(controller.reveal_decision(Coordinate(8, 15)))
+            solver.play(controller)
+            if controller.get_game_state().finished:
+                continue
+            start = time.perf_counter()
+            mine_probabilities(controller.board)
+            self.assertLess(time.perf_counter() - start, 0.1)
+
+
+class TestNoGuess(unittest.TestCase):
+
+    def assert_no_guess(self, width: int, height: int, num_mines: int, mines, start: Coordinate):
+        self.assertEqual(len(set(mines)), num_mines)
+        for row in range(max(start.row - 1, 0), min(start.row + 2, height)):
+            for col in range(max(start.col - 1, 0), min(start.col + 2, width)):
+                self.assertNotIn(row * width + col, mines)
+        self.assertTrue(play_without_guessing(width, height, num_mines, set(mines), start).get_game_state().win)
+
+    def test_generate(self):
+        for seed in range(5):
+            layout = generate_no_guess(16, 16, 40, seed=seed)
+            self.assert_no_guess(16, 16, 40, layout.mines, layout.start)
+            self.assertEqual(generate_no_guess(16, 16, 40, seed=seed), layout)
+        layout = generate_no_guess(30, 16, 99, seed=1, start=Coordinate(0, 29))
+        self.assertEqual(layout.start, Coordinate(0, 29))
+        self.assert_no_guess(30, 16, 99, layout.mines, layout.start)
+        with self.assertRaises(ValueError):
+            generate_no_guess(4, 4, 13)
+
+    def test_board_takes_from_pool(self):
+        pool = NoGuessPool(size=1, workers=0, seed=1, difficulties=[Difficulty.EASY])
+        controller = Controller(10, 10, 10, board_class=partial(NoGuessBoard, pool=pool))
+        board = controller.board
+        self.assertEqual(pool.ready(Difficulty.EASY), 1)
+        pool.close()
+        for _ in range(3):
+            # The last reset finds the closed pool empty and generates the layout itself
+            mines = {index for index in range(100) if board.get_cell_value(Coordinate(*divmod(index, 10))).isMine()}
+            self.assert_no_guess(10, 10, 10, mines, board.start_cell)
+            self.assertTrue(controller.reveal_decision(board.start_cell))
+            controller.reset()
+            self.assertEqual(board.num_revealed, 0)
+        self.assertEqual(pool.ready(Difficulty.EASY), 0)
+
+    def test_first_click(self):
+        controller = Controller(16, 16, 40, board_class=partial(NoGuessBoard, safe_first_click=True), seed=3)
+        self.assertIsNone(controller.board.start_cell)
+        controller.reveal_decision(Coordinate(5, 9))
+        self.assertEqual(controller.board.start_cell, Coordinate(5, 9))
+        mines = [index for index in range(256) if controller.board.get_cell_value(Coordinate(*divmod(index, 16))).isMine()]
+        self.assert_no_guess(16, 16, 40, mines, Coordinate(5, 9))
+
+    def test_failed_generation(self):
+        class InlineExecutor:
+            def submit(self, function, *args, **kwargs):
+                future = Future()
+                try:
+                    future.set_result(function(*args, **kwargs))
+                except Exception as error:
+                    future.set_exception(error)
+                return future
+
+            def shutdown(self, cancel_futures=False):
+                pass
+
+        pool = NoGuessPool(size=1, workers=0, seed=1, difficulties=[Difficulty.EASY])
+        layout = pool.take(Difficulty.EASY)
+        with mock.patch.object(noGuess, "generate_no_guess", side_effect=RuntimeError("worker failed")):
+            with self.assertRaises(RuntimeError):
+                pool.take(Difficulty.EASY)
+            # A worker's failure is logged and the layout generated again
+            pool._executor = InlineExecutor()
+            noGuess.generate_no_guess.side_effect = [RuntimeError("worker failed"), layout]
+            with self.assertLogs("noGuess", "ERROR") as logs:
+                self.assertIsNone(pool.take(Difficulty.EASY))
+        self.assertIn("worker failed", logs.output[0])
+        self.assertEqual(pool.take(Difficulty.EASY), layout)
+        pool.close()
+
+    def test_process_pool(self):
+        with NoGuessPool(size=2, workers=2, difficulties=[Difficulty.MEDIUM]) as pool:
+            deadline = time.perf_counter() + 60
+            while pool.ready(Difficulty.MEDIUM) < 2 and time.perf_counter() < deadline:
+                time.sleep(0.01)
+            layout = pool.take(Difficulty.MEDIUM)
+        self.assert_no_guess(16, 16, 40, layout.mines, layout.start)
+        with self.assertRaises(KeyError):
+            pool.take(Difficulty.EASY)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,8 +1,10 @@
-from typing import Tuple, List, Union
+import sys
+from typing import Iterable, Tuple, List, TextIO, Union
 
 from coordinate import Coordinate
 from controller import Controller
 from cellEntry import Entry, EntryValue
+import profiling
 
 # TODO: Use JavaScript, HTML, CSS for game display. Convert Python into JS
 
@@ -14,17 +16,20 @@ class TextView:
                  width: int,
                  height: int,
                  num_mines: int,
+                 controller: Controller = None,
+                 play: bool = True
                  ):
         """
         :param width: The horizontal span of the array
         :param height: The vertical span of the array
         :param num_mines: The number of mines to be seeded
-        :param controller: A controller class instance
+        :param controller: A controller class instance. Created from the dimensions if None
+        :param play: Whether to start the input loop right away
         """
         self.width = width
         self.height = height
         self.num_mines = num_mines
-        self.controller = Controller(self.width, self.height, self.num_mines)
+        self.controller = controller or Controller(self.width, self.height, self.num_mines)
         self.reveal_dict = {
             0: ' 0  ', 1: ' 1  ', 2: ' 2  ',
             3: ' 3  ', 4: ' 4  ', 5: ' 5  ',
@@ -35,7 +40,8 @@ class TextView:
         self.flag_value = "FLAG"
         self.cell_view = None
         self.create_cell_view()
-        self.main()
+        if play:
+            self.main()
 
     def create_cell_view(self) -> List[List[str]]:
         """Create text view of cells."""
@@ -63,6 +69,13 @@ class TextView:
 
         self.cell_view[index.row][index.col] = self.reveal_dict[value.value]
 
+    def reveal_cells(self, batch: Iterable[Tuple[Coordinate, EntryValue]]) -> None:
+        """Reveals a batch of cells, such as a cascade or the game over reveal, in the text view."""
+
+        cell_view, reveal_dict = self.cell_view, self.reveal_dict
+        for index, value in batch:
+            cell_view[index.row][index.col] = reveal_dict[value.value]
+
     def flag_cell(self, index: Coordinate) -> None:
         """Flags cell in cell_view"""
 
@@ -88,6 +101,19 @@ class TextView:
 
         print("YOU WIN!")
 
+    def profile_command(self, args: List[str]) -> None:
+        """Handles "profile [on|off|reset]". Without an argument prints the counters."""
+
+        action = args[0].lower() if args else ""
+        if action == "on":
+            profiling.enable()
+        elif action == "off":
+            profiling.disable()
+        elif action == "reset":
+            profiling.reset()
+        print("Profiling " + ("on" if profiling.is_enabled() else "off"))
+        print(profiling.report())
+
     def main(self) -> None:
         self.show_grid()
         while True:
@@ -98,6 +124,9 @@ class TextView:
                 print()
                 if cmd.lower()[0] == "e":
                     break
+                if cmd.lower()[0] == "p":
+                    self.profile_command(coords)
+                    continue
                 input_coord = Coordinate(int(coords[0]), int(coords[1]))
                 if cmd.lower()[0] == "f":
                     is_flagged = self.controller.update_flagged_cell(
@@ -108,15 +137,9 @@ class TextView:
                         self.unflag_cell(input_coord)
                 elif cmd.lower()[0] == "r":
                     result = self.controller.reveal_decision(input_coord)
-                    mine_found = False
-                    for output_coord, value in result:
-                        if value.isMine():
-                            mine_found = True
-                            break
-                        self.reveal_cell(output_coord, value)
-                    if mine_found:
-                        for output_coord, value in self.controller.reveal_all_cells():
-                            self.reveal_cell(output_coord, value)
+                    if any(value.isMine() for _, value in result):
+                        result = self.controller.reveal_all_cells()
+                    self.reveal_cells(result)
                 else:
                     print("Unknown command")
 
@@ -140,3 +163,125 @@ class TextView:
 
             except Exception:
                 print("Incorrect selection or format")
+
+
+
+class AnsiTextView(TextView):
+    """Text interface that only repaints the cells that changed since the last frame.
+
+    The first frame, and the first one after create_cell_view, is drawn in
+    full. Afterwards show_grid formats again only the rows holding cells
+    changed by reveal_cell, reveal_cells, flag_cell or unflag_cell, compares
+    them with the row strings cached from the last frame, and moves the
+    cursor to each cell that differs with ANSI escape codes. The whole
+    update goes out in one write. Needs a terminal with ANSI support.
+    """
+
+    # Lines above the first grid row: wins, losses and column numbers
+    HEADER_LINES = 3
+
+    def __init__(self,
+                 width: int,
+                 height: int,
+                 num_mines: int,
+                 controller: Controller = None,
+                 play: bool = True,
+                 output: TextIO = None
+                 ):
+        """
+        :param width: The horizontal span of the array
+        :param height: The vertical span of the array
+        :param num_mines: The number of mines to be seeded
+        :param controller: A controller class instance. Created from the dimensions if None
+        :param play: Whether to start the input loop right away
+        :param output: The stream frames are written to. Defaults to sys.stdout
+        """
+        self.output = output or sys.stdout
+        self._dirty = set()
+        # Row strings of the last frame, or None until the next full redraw
+        self._row_cache = None
+        self._status = None
+        super().__init__(width, height, num_mines, controller, play)
+
+    def create_cell_view(self) -> List[List[str]]:
+        """Create text view of cells. The next frame is drawn in full."""
+
+        super().create_cell_view()
+        self._dirty = set()
+        self._row_cache = None
+
+    def _row_prefix(self, row: int) -> str:
+        return str(row) + (":" if row > 9 else " :")
+
+    def _row_text(self, row: int) -> str:
+        return self._row_prefix(row) + "".join("  " + cell for cell in self.cell_view[row])
+
+    def reveal_cell(self, index: Coordinate, value: EntryValue) -> None:
+        super().reveal_cell(index, value)
+        self._dirty.add((index.row, index.col))
+
+    def reveal_cells(self, batch: Iterable[Tuple[Coordinate, EntryValue]]) -> None:
+        cell_view, reveal_dict, dirty = self.cell_view, self.reveal_dict, self._dirty
+        for index, value in batch:
+            cell_view[index.row][index.col] = reveal_dict[value.value]
+            dirty.add((index.row, index.col))
+
+    def flag_cell(self, index: Coordinate) -> None:
+        super().flag_cell(index)
+        self._dirty.add((index.row, index.col))
+
+    def unflag_cell(self, index: Coordinate) -> None:
+        super().unflag_cell(index)
+        self._dirty.add((index.row, index.col))
+
+    def _status_lines(self) -> Tuple[str, str, str]:
+        return ("Wins: " + str(self.controller.get_wins()),
+                "Losses: " + str(self.controller.get_losses()),
+                "Mines remaining: " + str(self.controller.get_num_mines()))
+
+    def _repaint_row(self, parts: List[str], row: int, cols: Iterable[int]) -> None:
+        """Formats a row again and adds a cursor move and text for each of the given cells that differs."""
+
+        old, new = self._row_cache[row], self._row_text(row)
+        if new == old:
+            return
+        line = self.HEADER_LINES + row + 1
+        prefix = len(self._row_prefix(row))
+        for col in sorted(cols):
+            cell = self.cell_view[row][col]
+            start = prefix + col * (len(cell) + 2) + 2
+            if old[start:start + len(cell)] != cell:
+                parts.append("\x1b[{};{}H{}".format(line, start + 1, cell))
+        self._row_cache[row] = new
+
+    def show_grid(self) -> None:
+        """Draws the grid, repainting only the cells changed since the last frame."""
+
+        status = self._status_lines()
+        # Line the prompt and messages start on, 1-based like the escape codes
+        below = self.HEADER_LINES + self.height + 2
+        if self._row_cache is None:
+            top_row = "".join(" " * 4 + str(i) + ":" for i in range(self.width))
+            self._row_cache = [self._row_text(row) for row in range(self.height)]
+            parts = ["\x1b[H\x1b[2J", status[0], "\n", status[1], "\n", " ", top_row, "\n"]
+            for text in self._row_cache:
+                parts.append(text)
+                parts.append("\n")
+            parts.append(status[2])
+            parts.append("\n")
+        else:
+            parts = []
+            dirty_rows = {}
+            for row, col in self._dirty:
+                dirty_rows.setdefault(row, []).append(col)
+            for row in sorted(dirty_rows):
+                self._repaint_row(parts, row, dirty_rows[row])
+            for line, old, new in zip((1, 2, below - 1), self._status, status):
+                if old != new:
+                    parts.append("\x1b[{};1H\x1b[K{}".format(line, new))
+            # Clear the previous prompt and messages
+            parts.append("\x1b[{};1H\x1b[J".format(below))
+        self._dirty.clear()
+        self._status = status
+        self.output.write("".join(parts))
+        self.output.flush()
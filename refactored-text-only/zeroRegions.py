@@ -0,0 +1,61 @@
+from array import array
+from typing import List, Optional
+
+import board
+from coordinate import Coordinate, from_index
+from neighbors import neighbor_table
+
+
+class ZeroRegionIndex:
+    """Groups of connected zero cells together with the numbered cells bordering them.
+
+    Revealing any zero of a group reveals exactly that group and its border,
+    so the groups are found once per board layout and looked up on reveal.
+    """
+
+    def __init__(self, board: "board.Board"):
+        """
+        :param board: The Board whose layout is indexed
+        """
+        self._width = board.width
+        self._height = board.height
+        self._region_of = array('i', [-1]) * (self._width * self._height)
+        self._regions = []
+        self._build([board.get_cell_value(Coordinate(row, col)).value
+                     for row in range(self._height) for col in range(self._width)])
+
+    def _build(self, values: List[int]) -> None:
+        """Labels every zero cell with its region. Each region lists its zeros then its border."""
+
+        width = self._width
+        offsets = neighbor_table(width, self._height).offsets
+        region_of = self._region_of
+        for start, value in enumerate(values):
+            if value != 0 or region_of[start] != -1:
+                continue
+            label = len(self._regions)
+            region_of[start] = label
+            zeroes = [start]
+            border = set()
+            for cell in zeroes:
+                for offset in offsets(*divmod(cell, width)):
+                    adjacent = cell + offset
+                    if values[adjacent] != 0:
+                        border.add(adjacent)
+                    elif region_of[adjacent] == -1:
+                        region_of[adjacent] = label
+                        zeroes.append(adjacent)
+            self._regions.append(zeroes + sorted(border))
+
+    @property
+    def num_regions(self) -> int:
+        return len(self._regions)
+
+    def region(self, coord: Coordinate) -> Optional[List[Coordinate]]:
+        """Returns the cells revealed by revealing a zero, or None if the cell is not a zero."""
+
+        label = self._region_of[coord.row * self._width + coord.col]
+        if label == -1:
+            return None
+        width = self._width
+        return [from_index(cell, width) for cell in self._regions[label]]